@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+# bench/fake_naver.py
+# 실제 네이버 없이 성능을 재기 위한 로컬 가짜 사이트
+# (로그인 폼, GoBlogWrite.naver + iframe#mainFrame, SmartEditor 비슷한 에디터, 임시저장 토스트)
+#
+# 단독 실행: python bench/fake_naver.py --port 8765 --latency 0.2
+
+import os
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+LOGIN_COOKIE = "NID_AUT"
+
+LOGIN_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>가짜 네이버 로그인</title></head>
+<body>
+  <form onsubmit="return false;">
+    <input id="id" type="text">
+    <input id="pw" type="password">
+    <button id="log.login" type="button">로그인</button>
+  </form>
+  <script>
+    document.getElementById('log.login').addEventListener('click', function () {
+      var id = document.getElementById('id').value, pw = document.getElementById('pw').value;
+      if (!id || !pw) return;
+      fetch('/login', {method: 'POST', body: JSON.stringify({id: id, pw: pw})})
+        .then(function () { location.href = '/'; });
+    });
+  </script>
+</body></html>"""
+
+HOME_PAGE = """<!doctype html><html><head><meta charset="utf-8"></head><body>로그인됨</body></html>"""
+
+WRITE_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>가짜 블로그 글쓰기</title></head>
+<body style="margin:0">
+  <iframe id="mainFrame" src="/editor" style="width:100%;height:900px;border:0"></iframe>
+</body></html>"""
+
+EDITOR_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8">
+<style>
+  body { margin: 0; font-family: sans-serif; }
+  .se-popup-dim { position: fixed; inset: 0; background: rgba(0,0,0,.3); }
+  .se-popup { position: fixed; top: 40%; left: 40%; background: #fff; padding: 20px; }
+  .se-help-panel { position: fixed; right: 0; width: 200px; background: #eee; }
+  .se-section-documentTitle, .se-section-text { min-height: 40px; border: 1px solid #ccc; margin: 10px; }
+  .save_btn__bzc5B { margin: 1200px 10px 10px; }
+</style></head>
+<body>
+  <div class="se-content">
+    <div class="se-section-documentTitle" contenteditable="true"></div>
+    <div class="se-section-text" contenteditable="true"></div>
+  </div>
+  <button class="save_btn__bzc5B" type="button">저장</button>
+  __POPUP__
+  __HELP_PANELS__
+  <script>
+    // SmartEditor처럼 paste 이벤트를 직접 처리
+    document.addEventListener('paste', function (e) {
+      var text = e.clipboardData && e.clipboardData.getData('text/plain');
+      if (!text) return;
+      e.preventDefault();
+      text.split('\\n').forEach(function (line, i) {
+        if (i > 0) document.execCommand('insertParagraph');
+        if (line) document.execCommand('insertText', false, line);
+      });
+    });
+    // 차례로 뜨는 도움말: 팝업이 닫힌 뒤 첫 패널이 뜨고, 하나를 닫으면 잠시 뒤 다음 패널이 뜸
+    var SEQUENTIAL_HELP = __SEQUENTIAL_HELP__;
+    function showNextPanel() {
+      var next = document.querySelector('.se-help-panel[hidden]');
+      if (next) next.hidden = false;
+    }
+    if (SEQUENTIAL_HELP) document.querySelectorAll('.se-help-panel').forEach(function (p) { p.hidden = true; });
+    var cancel = document.querySelector('.se-popup-button-cancel');
+    if (cancel) cancel.addEventListener('click', function () {
+      document.querySelectorAll('.se-popup, .se-popup-dim').forEach(function (el) { el.remove(); });
+      if (SEQUENTIAL_HELP) setTimeout(showNextPanel, 150);
+    });
+    else if (SEQUENTIAL_HELP) setTimeout(showNextPanel, 150);
+    document.querySelectorAll('.se-help-panel-close-button').forEach(function (btn) {
+      btn.addEventListener('click', function () {
+        btn.parentNode.remove();
+        if (SEQUENTIAL_HELP) setTimeout(showNextPanel, 150);
+      });
+    });
+    document.querySelector('.save_btn__bzc5B').addEventListener('click', function () {
+      var payload = {
+        title: document.querySelector('.se-section-documentTitle').innerText,
+        body: document.querySelector('.se-section-text').innerText
+      };
+      fetch('/draft/save', {method: 'POST', body: JSON.stringify(payload)})
+        .then(function (r) { return r.json(); })
+        .then(function () {
+          var toast = document.createElement('div');
+          toast.className = 'se-toast-item__success';
+          toast.textContent = '저장됨';
+          document.body.appendChild(toast);
+        });
+    });
+  </script>
+</body></html>"""
+
+POPUP = """<div class="se-popup-dim"></div>
+  <div class="se-popup">작성 중인 글이 있습니다.
+    <button class="se-popup-button-cancel" type="button">취소</button>
+  </div>"""
+
+HELP_PANEL = """<div class="se-help-panel">도움말
+    <button class="se-help-panel-close-button" type="button">닫기</button>
+  </div>"""
+
+
+class FakeNaverServer:
+    """가짜 네이버를 백그라운드 스레드에서 띄우는 로컬 HTTP 서버
+
+    latency: 모든 요청에 더하는 인위적 지연(초), save_latency: 임시저장 요청에만 더하는 지연
+    sequential_help: 도움말 패널을 한꺼번에가 아니라 팝업이 닫힌 뒤 하나씩 차례로 띄움
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.0, save_latency: float = 0.0,
+                 popup: bool = True, help_panels: int = 2, sequential_help: bool = False):
+        self.latency = latency
+        self.save_latency = save_latency
+        self.popup = popup
+        self.help_panels = help_panels
+        self.sequential_help = sequential_help
+        self.drafts = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def login_url(self) -> str:
+        return f"{self.base_url}/nidlogin.login"
+
+    @property
+    def write_url(self) -> str:
+        return f"{self.base_url}/GoBlogWrite.naver"
+
+    def start(self) -> "FakeNaverServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-naver", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _record_draft(self, draft: dict):
+        with self._lock:
+            self.drafts.append(draft)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: str, content_type: str = "text/html; charset=utf-8",
+                      headers: dict = None):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _logged_in(self) -> bool:
+                return f"{LOGIN_COOKIE}=" in self.headers.get("Cookie", "")
+
+            def do_GET(self):
+                time.sleep(server.latency)
+                path = urlparse(self.path).path
+                if path == "/nidlogin.login":
+                    self._send(200, LOGIN_PAGE)
+                elif path == "/":
+                    self._send(200, HOME_PAGE)
+                elif path == "/GoBlogWrite.naver":
+                    if not self._logged_in():
+                        self._send(302, "", headers={"Location": "/nidlogin.login"})
+                    else:
+                        self._send(200, WRITE_PAGE)
+                elif path == "/editor":
+                    page = EDITOR_PAGE.replace("__POPUP__", POPUP if server.popup else "")
+                    page = page.replace("__SEQUENTIAL_HELP__", "true" if server.sequential_help else "false")
+                    self._send(200, page.replace("__HELP_PANELS__", HELP_PANEL * server.help_panels))
+                elif path == "/draft/list":
+                    self._send(200, json.dumps(server.drafts, ensure_ascii=False), "application/json")
+                else:
+                    self._send(404, "not found", "text/plain")
+
+            def do_POST(self):
+                time.sleep(server.latency)
+                path = urlparse(self.path).path
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if path == "/login":
+                    self._send(200, "{}", "application/json",
+                               headers={"Set-Cookie": f"{LOGIN_COOKIE}=fake-{payload.get('id')}; Path=/"})
+                elif path == "/draft/save":
+                    if not self._logged_in():
+                        self._send(401, json.dumps({"isSuccess": False}), "application/json")
+                        return
+                    time.sleep(server.save_latency)
+                    server._record_draft(payload)
+                    self._send(200, json.dumps({"isSuccess": True}), "application/json")
+                else:
+                    self._send(404, "not found", "text/plain")
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 가짜 네이버 서버")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("FAKE_NAVER_PORT", 8765)))
+    parser.add_argument("--latency", type=float, default=float(os.environ.get("FAKE_NAVER_LATENCY", 0)))
+    parser.add_argument("--save-latency", type=float, default=0.0)
+    parser.add_argument("--sequential-help", action="store_true", help="도움말 패널을 하나씩 차례로 띄움")
+    args = parser.parse_args()
+
+    server = FakeNaverServer(args.port, args.latency, args.save_latency,
+                             sequential_help=args.sequential_help).start()
+    print(f"🧪 가짜 네이버 서버 실행 중: {server.base_url}")
+    print(f"   NAVER_LOGIN_URL={server.login_url}")
+    print(f"   BLOG_WRITE_URL={server.write_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+# bench/run_bench.py
+# 가짜 네이버(bench/fake_naver.py)를 상대로 실제 자동화 함수와 /api/run-naver, direct 엔진을 돌려 성능 측정
+#
+# 예) python bench/run_bench.py --iterations 5 --sizes 100,1000,5000 --concurrency 1,2 --save baseline
+#     python bench/run_bench.py --compare bench/baselines/baseline.json
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_DIR = os.path.join(ROOT, "bench", "baselines")
+sys.path.insert(0, ROOT)
+
+import metrics
+from bench.fake_naver import FakeNaverServer
+from waits import percentile
+
+
+def make_body(chars: int) -> str:
+    """대략 chars 글자 분량, 80자 문단으로 나뉜 본문"""
+    line = "가나다라마바사아자차카타파하 벤치마크 본문입니다. " * 4
+    lines, total = [], 0
+    while total < chars:
+        piece = line[: min(80, chars - total)]
+        lines.append(piece)
+        total += len(piece)
+    return "\n".join(lines)
+
+
+class PeakMemory:
+    """측정하는 동안 (벤치 프로세스 + Chrome 프로세스) RSS 최댓값을 주기적으로 기록"""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self) -> int:
+        return metrics._rss_bytes("self") + sum(metrics._rss_bytes(p) for p in metrics.chrome_processes())
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._sample())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def summarize(latencies: List[float], wall: float, peak_bytes: int, failures: int) -> dict:
+    return {
+        "runs": len(latencies),
+        "failures": failures,
+        "p50_sec": round(percentile(latencies, 50), 3) if latencies else None,
+        "p95_sec": round(percentile(latencies, 95), 3) if latencies else None,
+        "throughput_per_min": round(len(latencies) / wall * 60, 2) if wall > 0 else None,
+        "peak_rss_mb": round(peak_bytes / 1024 / 1024, 1),
+    }
+
+
+def run_concurrently(task: Callable[[int], None], iterations: int, concurrency: int) -> dict:
+    latencies, failures = [], 0
+    lock = threading.Lock()
+
+    def one(i):
+        nonlocal failures
+        started = time.perf_counter()
+        try:
+            task(i)
+        except Exception as e:
+            print(f"   ❌ {i}번째 실행 실패: {e}")
+            with lock:
+                failures += 1
+            return
+        with lock:
+            latencies.append(time.perf_counter() - started)
+
+    with PeakMemory() as memory:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(one, range(iterations)))
+        wall = time.perf_counter() - started
+    return summarize(latencies, wall, memory.peak, failures)
+
+
+VISIBLE_HELP_PANELS_JS = """
+var frame = document.querySelector('iframe#mainFrame');
+var doc = frame ? frame.contentDocument : document;
+return Array.prototype.filter.call(doc.querySelectorAll('.se-help-panel'),
+  function (p) { return p.getClientRects().length > 0; }).length;
+"""
+
+
+def assert_help_panels_closed(driver):
+    """저장 클릭은 패널에 가려지지 않으므로, 남은 도움말 패널은 여기서 따로 확인"""
+    driver.switch_to.default_content()
+    left = driver.execute_script(VISIBLE_HELP_PANELS_JS)
+    if left:
+        raise AssertionError(f"도움말 패널 {left}개가 닫히지 않았습니다.")
+
+
+# ---- 시나리오 ----
+def bench_functions(sizes: List[int], iterations: int, concurrencies: List[int]) -> dict:
+    """init_driver → run_automation(로그인/글쓰기 페이지/작성/저장)을 직접 호출(콜드 브라우저 기준)"""
+    from naver_manual_login import init_driver, quit_driver, run_automation
+
+    results = {}
+    for size in sizes:
+        body = make_body(size)
+        for concurrency in concurrencies:
+            def task(i):
+                driver = init_driver()
+                try:
+                    run_automation(driver, f"벤치 {i}", body)
+                    assert_help_panels_closed(driver)
+                finally:
+                    quit_driver(driver)
+
+            key = f"chars={size},concurrency={concurrency}"
+            print(f"⏱️ functions {key}")
+            results[key] = run_concurrently(task, iterations, concurrency)
+    return results
+
+
+def bench_direct(sizes: List[int], iterations: int, concurrencies: List[int], fake: FakeNaverServer) -> dict:
+    """direct 엔진: 로그인 쿠키만으로 /draft/save를 직접 호출(브라우저 없음)
+
+    쿠키는 가짜 사이트 /login에서 받아 Selenium 로그인 결과(CDP 쿠키 형식)를 흉내 냄
+    """
+    import direct_save
+
+    with urllib.request.urlopen(urllib.request.Request(
+            fake.base_url + "/login", data=b'{"id": "bench"}', method="POST")) as res:
+        name, value = res.headers["Set-Cookie"].split(";")[0].split("=", 1)
+    cookies = [{"name": name, "value": value, "domain": "127.0.0.1", "path": "/"}]
+    saver = direct_save.DirectSaver(save_url=fake.base_url + "/draft/save")
+
+    results = {}
+    try:
+        for size in sizes:
+            body = make_body(size)
+            for concurrency in concurrencies:
+                def task(i):
+                    saver.save(f"bench-{i % concurrency}", cookies, f"벤치 {i}", body)
+
+                key = f"chars={size},concurrency={concurrency}"
+                print(f"⏱️ direct {key}")
+                results[key] = run_concurrently(task, iterations, concurrency)
+    finally:
+        saver.close()
+    return results
+
+
+def bench_api(sizes: List[int], iterations: int, concurrencies: List[int], port: int) -> dict:
+    """uvicorn으로 server.py를 띄우고 POST /api/run-naver → GET /api/jobs/{id} 완료까지 측정"""
+    import uvicorn
+    import server
+
+    config = uvicorn.Config(server.app, host="127.0.0.1", port=port, log_level="warning")
+    api = uvicorn.Server(config)
+    thread = threading.Thread(target=api.run, daemon=True)
+    thread.start()
+    while not api.started:
+        time.sleep(0.05)
+    base = f"http://127.0.0.1:{port}"
+
+    def call(method: str, path: str, payload: dict = None) -> dict:
+        data = json.dumps(payload).encode() if payload is not None else None
+        req = urllib.request.Request(base + path, data=data, method=method,
+                                     headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req) as res:
+            return json.loads(res.read())
+
+    results = {}
+    try:
+        for size in sizes:
+            body = make_body(size)
+            for concurrency in concurrencies:
+                def task(i):
+                    job = call("POST", "/api/run-naver", {"user_id": f"bench-{i % concurrency}",
+                                                          "title": f"벤치 {i}", "body": body})
+                    while True:
+                        state = call("GET", f"/api/jobs/{job['job_id']}")
+                        if state["status"] not in ("queued", "running"):
+                            break
+                        time.sleep(0.1)
+                    if state["status"] != "succeeded":
+                        raise RuntimeError(f"{state['status']}: {state['error']}")
+
+                key = f"chars={size},concurrency={concurrency}"
+                print(f"⏱️ api {key}")
+                results[key] = run_concurrently(task, iterations, concurrency)
+    finally:
+        api.should_exit = True
+        thread.join()
+    return results
+
+
+def compare(current: dict, baseline: dict):
+    """같은 항목끼리 p50/p95/처리량/메모리 변화를 출력"""
+    for scenario, entries in current.get("results", {}).items():
+        for key, now in entries.items():
+            before = baseline.get("results", {}).get(scenario, {}).get(key)
+            if not before:
+                continue
+            print(f"📊 {scenario} {key}")
+            for metric in ("p50_sec", "p95_sec", "throughput_per_min", "peak_rss_mb"):
+                a, b = before.get(metric), now.get(metric)
+                if a and b is not None:
+                    print(f"   {metric}: {a} → {b} ({(b - a) / a * 100:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 네이버 기반 오프라인 벤치마크")
+    parser.add_argument("--scenarios", default="functions,api,direct")
+    parser.add_argument("--sizes", default="100,1000,5000", help="본문 글자 수 목록")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--concurrency", default="1,2", help="동시 실행 수 목록")
+    parser.add_argument("--latency", type=float, default=0.0, help="가짜 사이트 요청당 지연(초)")
+    parser.add_argument("--save-latency", type=float, default=0.0, help="임시저장 요청 지연(초)")
+    parser.add_argument("--sequential-help", action="store_true", help="도움말 패널을 팝업이 닫힌 뒤 하나씩 띄움")
+    parser.add_argument("--api-port", type=int, default=8799)
+    parser.add_argument("--save", metavar="NAME", help="결과를 bench/baselines/NAME.json으로 저장")
+    parser.add_argument("--compare", metavar="PATH", help="기존 베이스라인과 비교")
+    args = parser.parse_args()
+
+    fake = FakeNaverServer(latency=args.latency, save_latency=args.save_latency,
+                           sequential_help=args.sequential_help).start()
+    # naver_manual_login을 import하기 전에 가짜 사이트 주소와 헤드리스 실행을 설정
+    os.environ["NAVER_LOGIN_URL"] = fake.login_url
+    os.environ["BLOG_WRITE_URL"] = fake.write_url
+    os.environ.setdefault("NAVER_ID", "bench")
+    os.environ.setdefault("NAVER_PW", "bench")
+    os.environ.setdefault("DISPLAY", ":99")
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    concurrencies = [int(c) for c in args.concurrency.split(",")]
+    scenarios = args.scenarios.split(",")
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "settings": vars(args),
+        "results": {},
+    }
+    try:
+        if "functions" in scenarios:
+            report["results"]["functions"] = bench_functions(sizes, args.iterations, concurrencies)
+        if "api" in scenarios:
+            report["results"]["api"] = bench_api(sizes, args.iterations, concurrencies, args.api_port)
+        if "direct" in scenarios:
+            report["results"]["direct"] = bench_direct(sizes, args.iterations, concurrencies, fake)
+    finally:
+        fake.stop()
+
+    print(json.dumps(report["results"], ensure_ascii=False, indent=2))
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+    if args.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        path = os.path.join(BASELINE_DIR, f"{args.save}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 베이스라인 저장: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+# browser_pool.py
+# FastAPI 앱이 소유하는 헤드리스 Chrome 풀: 요청마다 새 프로세스를 띄우지 않고 드라이버를 재사용
+
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+from urllib.parse import urlsplit
+
+from selenium import webdriver
+
+import resource_blocking
+from naver_manual_login import BLOG_WRITE_URL, NAVER_LOGIN_URL, init_driver, quit_driver
+
+POOL_MIN_SIZE = int(os.environ.get("BROWSER_POOL_MIN", 1))
+POOL_MAX_SIZE = int(os.environ.get("BROWSER_POOL_MAX", 2))
+POOL_MAX_JOBS = int(os.environ.get("BROWSER_MAX_JOBS", 20))           # N회 사용 후 재생성
+POOL_MAX_AGE = float(os.environ.get("BROWSER_MAX_AGE_MIN", 30)) * 60  # M분 경과 후 재생성
+POOL_LEASE_TIMEOUT = float(os.environ.get("BROWSER_LEASE_TIMEOUT", 120))
+POOL_KILL_GRACE = float(os.environ.get("BROWSER_KILL_GRACE", 5))       # 강제 중단 시 quit을 기다리는 시간(초)
+POOL_MAINTAIN_INTERVAL = float(os.environ.get("BROWSER_POOL_MAINTAIN_SEC", 30))  # 대기 중 드라이버 수명 확인 주기
+
+# 반납 시 저장소(localStorage/sessionStorage/IndexedDB 등)를 지울 출처: 드라이버는 사용자끼리 공유됨
+RESET_STORAGE_TYPES = "local_storage,session_storage,indexeddb,websql,cache_storage,service_workers"
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}" if parts.scheme in ("http", "https") else ""
+
+
+class PoolExhausted(Exception):
+    """제한 시간 안에 빌려줄 드라이버가 없을 때"""
+
+
+class PooledDriver:
+    """풀에서 관리하는 드라이버 하나와 사용 이력"""
+
+    def __init__(self, driver: webdriver.Chrome):
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.jobs = 0
+        self.killed = False  # 작업 중단으로 강제 종료됨(반납 시 재사용하지 않음)
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+    def is_healthy(self) -> bool:
+        """driver.current_url 호출이 성공하면 살아있는 것으로 판단"""
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def reset(self):
+        """다음 사용자를 위해 쿠키/웹 저장소/프레임/페이지 상태와 남은 performance 로그 초기화"""
+        self.driver.switch_to.default_content()
+        self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        origins = {_origin(self.driver.current_url), _origin(NAVER_LOGIN_URL), _origin(BLOG_WRITE_URL)}
+        for origin in filter(None, origins):
+            self.driver.execute_cdp_cmd(
+                "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": RESET_STORAGE_TYPES}
+            )
+        self.driver.get("about:blank")
+        resource_blocking.discard_log(self.driver)
+
+    def quit(self):
+        if self.killed:
+            return
+        try:
+            quit_driver(self.driver)
+        except Exception:
+            pass
+
+    def kill(self, grace: float = POOL_KILL_GRACE):
+        """실행 중인 WebDriver 호출을 끊기 위해 강제 종료
+
+        quit이 grace초 안에 끝나지 않으면(chromedriver가 멈춘 경우) chromedriver 프로세스를 직접 죽임
+        """
+        if self.killed:
+            return
+        self.killed = True
+        t = threading.Thread(target=quit_driver, args=(self.driver,), name="browser-kill", daemon=True)
+        t.start()
+        t.join(grace)
+        if t.is_alive():
+            process = getattr(getattr(self.driver, "service", None), "process", None)
+            if process is not None:
+                process.kill()
+
+
+class BrowserPool:
+    """min/max 크기, 헬스 체크, 사용 횟수·수명 기반 재활용을 지원하는 드라이버 풀"""
+
+    def __init__(
+        self,
+        factory: Callable[[], webdriver.Chrome] = init_driver,
+        min_size: int = POOL_MIN_SIZE,
+        max_size: int = POOL_MAX_SIZE,
+        max_jobs: int = POOL_MAX_JOBS,
+        max_age: float = POOL_MAX_AGE,
+    ):
+        if max_size < 1 or min_size > max_size:
+            raise ValueError(f"잘못된 풀 크기: min={min_size}, max={max_size}")
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_jobs = max_jobs
+        self.max_age = max_age
+        self._idle: List[PooledDriver] = []
+        self._total = 0          # 대기 + 대여 중 + 생성 중
+        self._leased = 0
+        self._in_use: Dict[int, PooledDriver] = {}  # id(driver) → 대여 중인 항목
+        self._closed = False
+        self._cond = threading.Condition()
+
+    # ---- 생성/폐기 ----
+    def _create(self) -> PooledDriver:
+        try:
+            return PooledDriver(self.factory())
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+
+    def _discard(self, item: PooledDriver):
+        item.quit()
+        with self._cond:
+            self._total -= 1
+            self._cond.notify()
+
+    def _replenish(self):
+        """min_size보다 적으면 다시 채움(폐기 후, 또는 예열이 실패했을 때)"""
+        try:
+            self.warm_up()
+        except Exception as e:
+            print(f"❌ 브라우저 풀 보충 실패: {e}")
+
+    def _recycle(self, item: PooledDriver):
+        """폐기한 드라이버를 종료하고 min_size까지 다시 채움"""
+        self._discard(item)
+        self._replenish()
+
+    def _recycle_later(self, item: PooledDriver):
+        """반납/대여 중인 워커 스레드가 Chrome 종료·재생성을 기다리지 않도록 백그라운드에서 처리"""
+        threading.Thread(target=self._recycle, args=(item,), name="browser-pool-recycle", daemon=True).start()
+
+    def _expired(self, item: PooledDriver) -> bool:
+        return item.jobs >= self.max_jobs or item.age >= self.max_age
+
+    def warm_up(self):
+        """min_size 만큼 미리 브라우저를 띄워 둠(앱 시작 시, 그리고 폐기 후 보충할 때 호출)"""
+        while True:
+            with self._cond:
+                if self._closed or self._total >= self.min_size:
+                    return
+                self._total += 1
+            item = self._create()
+            with self._cond:
+                closed = self._closed
+                if not closed:
+                    self._idle.append(item)
+                    self._cond.notify()
+            if closed:
+                self._discard(item)
+                return
+            print(f"🔥 브라우저 풀 예열: {len(self._idle)}/{self.min_size}")
+
+    # ---- 대여/반납 ----
+    def acquire(self, timeout: float = POOL_LEASE_TIMEOUT) -> PooledDriver:
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolExhausted("브라우저 풀이 종료되었습니다.")
+                    if self._idle:
+                        item = self._idle.pop()
+                        break
+                    if self._total < self.max_size:
+                        self._total += 1
+                        item = None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolExhausted(f"{timeout:g}초 안에 사용 가능한 브라우저가 없습니다.")
+                    self._cond.wait(remaining)
+
+            if item is None:
+                item = self._create()
+            elif self._expired(item) or not item.is_healthy():
+                self._recycle_later(item)
+                continue
+
+            with self._cond:
+                self._leased += 1
+                self._in_use[id(item.driver)] = item
+            item.jobs += 1
+            return item
+
+    def release(self, item: PooledDriver, broken: bool = False):
+        with self._cond:
+            self._leased -= 1
+            self._in_use.pop(id(item.driver), None)
+        if self._closed:
+            self._discard(item)
+            return
+        if broken or item.killed or self._expired(item):
+            self._recycle_later(item)
+            return
+        try:
+            item.reset()
+        except Exception:
+            self._recycle_later(item)
+            return
+        with self._cond:
+            self._idle.append(item)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self, timeout: float = POOL_LEASE_TIMEOUT):
+        """with pool.lease() as driver: ... 형태로 드라이버를 빌려 씀"""
+        item = self.acquire(timeout)
+        broken = False
+        try:
+            yield item.driver
+        except Exception:
+            # 작업 중 예외가 나면 드라이버 상태를 믿을 수 없으므로 헬스 체크로 판단
+            broken = item.killed or not item.is_healthy()
+            raise
+        finally:
+            self.release(item, broken=broken)
+
+    def kill(self, driver: webdriver.Chrome):
+        """대여 중인 드라이버를 강제 종료(작업 취소/시간 초과 시): 진행 중인 호출이 예외로 끝나고, 반납 시 폐기됨"""
+        with self._cond:
+            item = self._in_use.get(id(driver))
+        if item is not None:
+            item.kill()
+
+    def start_maintenance(self, interval: float = POOL_MAINTAIN_INTERVAL):
+        """대기 중인 드라이버가 max_age를 넘기면 다음 대여 전에 미리 교체하는 백그라운드 스레드 시작"""
+        threading.Thread(target=self._maintain, args=(interval,), name="browser-pool-maintain", daemon=True).start()
+
+    def _maintain(self, interval: float):
+        while True:
+            with self._cond:
+                self._cond.wait(interval)
+                if self._closed:
+                    return
+                expired = [item for item in self._idle if self._expired(item)]
+                self._idle = [item for item in self._idle if item not in expired]
+            for item in expired:
+                print(f"♻️ 오래된 브라우저 교체 ({item.age / 60:.0f}분 사용)")
+                self._discard(item)
+            self._replenish()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for item in idle:
+            self._discard(item)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "total": self._total,
+                "idle": len(self._idle),
+                "leased": self._leased,
+                "max_jobs": self.max_jobs,
+                "max_age_sec": self.max_age,
+            }
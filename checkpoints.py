@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# checkpoints.py
+# 자동화를 명시적인 단계(로그인 → 에디터 열기 → 제목 → 본문 → 저장)로 나누고,
+# 일시적인 실패는 처음부터 다시 하지 않고 같은 드라이버에서 마지막으로 통과한 단계 다음부터 재시도
+#
+# 단계별 정책 덮어쓰기: PHASE_RETRY="editor_open=4:1.5,saved=2:0.5" (단계=시도 횟수:첫 대기초)
+
+import os
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, TypeVar
+
+from selenium.common.exceptions import (
+    InvalidSessionIdException,
+    NoSuchWindowException,
+    WebDriverException,
+)
+
+import metrics
+import progress
+from text_input import InsertionError
+
+LOGGED_IN = "logged_in"
+EDITOR_OPEN = "editor_open"
+TITLE_WRITTEN = "title_written"
+BODY_WRITTEN = "body_written"
+SAVED = "saved"
+PHASES = (LOGGED_IN, EDITOR_OPEN, TITLE_WRITTEN, BODY_WRITTEN, SAVED)
+
+RETRY_BACKOFF_FACTOR = float(os.environ.get("RETRY_BACKOFF_FACTOR", 2))
+RETRY_MAX_BACKOFF = float(os.environ.get("RETRY_MAX_BACKOFF", 10))
+
+# 재시도하지 않는 실패: 브라우저가 죽었거나(같은 드라이버로 이어갈 수 없음),
+# 입력이 일부만 들어가 다시 입력하면 내용이 중복되는 경우
+NON_RETRYABLE = (InvalidSessionIdException, NoSuchWindowException, InsertionError)
+RETRYABLE = (WebDriverException,)  # TimeoutException, StaleElementReference 등 포함
+
+T = TypeVar("T")
+
+
+class RetryPolicy:
+    """attempts: 최대 시도 횟수(첫 시도 포함), backoff: 첫 재시도 전 대기(초, 이후 RETRY_BACKOFF_FACTOR배)"""
+
+    def __init__(self, attempts: int, backoff: float):
+        self.attempts = max(1, attempts)
+        self.backoff = backoff
+
+    def delay(self, retry: int) -> float:
+        return min(RETRY_MAX_BACKOFF, self.backoff * RETRY_BACKOFF_FACTOR ** (retry - 1))
+
+    def __repr__(self):
+        return f"RetryPolicy(attempts={self.attempts}, backoff={self.backoff})"
+
+
+# 로그인은 반복하면 보안 확인(캡차)이 뜰 수 있어 보수적으로, 프레임/토스트 대기는 넉넉히
+POLICIES: Dict[str, RetryPolicy] = {
+    LOGGED_IN: RetryPolicy(2, 2.0),
+    EDITOR_OPEN: RetryPolicy(3, 1.0),
+    TITLE_WRITTEN: RetryPolicy(2, 0.5),
+    BODY_WRITTEN: RetryPolicy(2, 0.5),
+    SAVED: RetryPolicy(3, 1.0),
+}
+
+
+def _load_overrides(spec: str):
+    for item in filter(None, (s.strip() for s in spec.split(","))):
+        phase, _, value = item.partition("=")
+        attempts, _, backoff = value.partition(":")
+        if phase not in POLICIES:
+            raise ValueError(f"알 수 없는 단계: {phase}")
+        POLICIES[phase] = RetryPolicy(int(attempts), float(backoff or POLICIES[phase].backoff))
+
+
+_load_overrides(os.environ.get("PHASE_RETRY", ""))
+
+
+class Checkpoint:
+    """글 하나를 쓰는 동안 통과한 단계와 재시도 기록"""
+
+    def __init__(self, reached: Optional[List[str]] = None):
+        self.reached: List[str] = list(reached or [])
+        self.retries: Counter = Counter()
+        self.retry_seconds = 0.0  # 실패 후 다시 한 작업 + 대기에 쓴 시간
+
+    def passed(self, phase: str) -> bool:
+        return phase in self.reached
+
+    def mark(self, phase: str):
+        if phase not in self.reached:
+            self.reached.append(phase)
+        progress.emit("checkpoint", step=phase)
+
+    @property
+    def last(self) -> Optional[str]:
+        return self.reached[-1] if self.reached else None
+
+    def to_dict(self) -> dict:
+        return {
+            "reached": list(self.reached),
+            "retries": dict(self.retries),
+            "retry_seconds": round(self.retry_seconds, 3),
+        }
+
+
+def run(
+    checkpoint: Checkpoint,
+    phase: str,
+    action: Callable[[int], T],
+    recover: Optional[Callable[[], None]] = None,
+    before_retry: Optional[Callable[[str], None]] = None,
+    policy: Optional[RetryPolicy] = None,
+) -> Optional[T]:
+    """단계 하나 실행: 이미 통과했으면 건너뛰고, 일시적 실패면 정책대로 기다렸다가 재시도
+
+    action(attempt): attempt는 0부터 시작(재시도 때 페이지를 다시 열지 등 판단용)
+    recover(): 재시도 전에 드라이버를 단계 시작 상태로 되돌림(예: 기본 문서로 나와 프레임 재진입)
+    before_retry(phase): 재시도 직전 호출(작업 취소/시간 초과 확인용 report)
+    """
+    if checkpoint.passed(phase):
+        return None
+    policy = policy or POLICIES[phase]
+    failed_at = None
+    for attempt in range(policy.attempts):
+        try:
+            result = action(attempt)
+        except NON_RETRYABLE:
+            raise
+        except RETRYABLE as e:
+            if attempt + 1 >= policy.attempts:
+                raise
+            failed_at = failed_at or time.perf_counter()
+            checkpoint.retries[phase] += 1
+            metrics.PHASE_RETRIES.inc(phase=phase, error=type(e).__name__)
+            delay = policy.delay(attempt + 1)
+            progress.emit(
+                "phase_retry",
+                f"🔁 {phase} 단계 실패({type(e).__name__}), {delay:.1f}초 뒤 "
+                f"'{checkpoint.last or '처음'}' 이후부터 다시 시도합니다. ({attempt + 2}/{policy.attempts})",
+                step=phase, attempt=attempt + 2, error=str(e).splitlines()[0] if str(e) else type(e).__name__,
+            )
+            time.sleep(delay)
+            if before_retry is not None:
+                before_retry(f"retry_{phase}")
+            if recover is not None:
+                try:
+                    recover()
+                except NON_RETRYABLE:
+                    raise
+                except RETRYABLE:
+                    pass  # 복구 실패는 다음 시도에서 다시 드러남
+            continue
+        if failed_at is not None:
+            checkpoint.retry_seconds += time.perf_counter() - failed_at
+        checkpoint.mark(phase)
+        return result
+    return None
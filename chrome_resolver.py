@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+# chrome_resolver.py
+# Chrome 바이너리/ChromeDriver 경로와 버전을 한 번만 찾아 매니페스트 파일에 저장하고 이후 재사용
+#
+# 빌드 단계에서 미리 실행: python chrome_resolver.py
+
+import os
+import sys
+import json
+import time
+import shutil
+import subprocess
+import threading
+from typing import Optional
+
+MANIFEST_PATH = os.environ.get(
+    "CHROME_MANIFEST",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".chrome_manifest.json"),
+)
+
+CHROME_PATHS = [
+    '/usr/bin/google-chrome-stable',
+    '/usr/bin/google-chrome',
+    '/usr/bin/chromium-browser',
+    '/opt/google/chrome/chrome',
+    '/snap/bin/chromium',
+    '/usr/bin/chromium'
+]
+CHROME_COMMANDS = ['google-chrome', 'google-chrome-stable', 'chromium-browser', 'chromium']
+
+_lock = threading.Lock()
+_cached: Optional[dict] = None
+
+
+def _fingerprint(path: Optional[str]) -> Optional[list]:
+    """파일이 바뀌었는지(업데이트 등) 확인하기 위한 [크기, 수정 시각]"""
+    if not path or not os.path.exists(path):
+        return None
+    st = os.stat(path)
+    return [st.st_size, int(st.st_mtime)]
+
+
+def _version(path: Optional[str]) -> Optional[str]:
+    """'Google Chrome 120.0.6099.109' → '120.0.6099.109' (해석할 때 한 번만 실행)"""
+    if not path:
+        return None
+    try:
+        out = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=30).stdout
+    except Exception:
+        return None
+    for token in out.split():
+        if token[:1].isdigit() and "." in token:
+            return token
+    return None
+
+
+def _major(version: Optional[str]) -> Optional[str]:
+    return version.split(".")[0] if version else None
+
+
+def find_chrome_binary() -> Optional[str]:
+    for path in CHROME_PATHS:
+        if os.path.exists(path):
+            return path
+    # 하위 프로세스로 which를 실행하지 않고 PATH에서 직접 찾기
+    for cmd in CHROME_COMMANDS:
+        found = shutil.which(cmd)
+        if found:
+            return found
+    return None
+
+
+def find_chromedriver() -> str:
+    path = os.environ.get("CHROMEDRIVER_PATH")
+    if path and os.path.exists(path):
+        return path
+    # 매니페스트가 없을 때만 webdriver-manager 다운로드 경로를 탐
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+def _is_valid(manifest: dict) -> bool:
+    """경로가 그대로 있고, 파일이 바뀌지 않았고, Chrome/드라이버 메이저 버전이 일치하는지"""
+    if not manifest.get("driver_path"):
+        return False
+    for key in ("chrome_binary", "driver_path"):
+        if _fingerprint(manifest.get(key)) != manifest.get(f"{key}_fingerprint"):
+            return False
+    chrome_major = _major(manifest.get("chrome_version"))
+    driver_major = _major(manifest.get("driver_version"))
+    return not (chrome_major and driver_major and chrome_major != driver_major)
+
+
+def _load() -> Optional[dict]:
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save(manifest: dict):
+    tmp = f"{MANIFEST_PATH}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, MANIFEST_PATH)
+
+
+def _resolve_fresh() -> dict:
+    chrome_binary = find_chrome_binary()
+    driver_path = find_chromedriver()
+    manifest = {
+        "chrome_binary": chrome_binary,
+        "chrome_binary_fingerprint": _fingerprint(chrome_binary),
+        "chrome_version": _version(chrome_binary),
+        "driver_path": driver_path,
+        "driver_path_fingerprint": _fingerprint(driver_path),
+        "driver_version": _version(driver_path),
+        "resolved_at": time.time(),
+    }
+    try:
+        _save(manifest)
+    except OSError as e:
+        print(f"⚠️ Chrome 매니페스트를 저장하지 못했습니다: {e}")
+    return manifest
+
+
+def resolve(force: bool = False) -> dict:
+    """캐시(메모리 → 매니페스트 파일) 순으로 확인하고, 무효일 때만 새로 탐색"""
+    global _cached
+    with _lock:
+        if not force:
+            if _cached is not None:
+                return _cached
+            manifest = _load()
+            if manifest and _is_valid(manifest):
+                _cached = manifest
+                return _cached
+        print("🔍 Chrome/ChromeDriver 경로를 새로 확인합니다...")
+        _cached = _resolve_fresh()
+        return _cached
+
+
+def cached() -> Optional[dict]:
+    """탐색 없이 현재 알고 있는 결과만 반환(/api/debug용)"""
+    return _cached if _cached is not None else _load()
+
+
+if __name__ == "__main__":
+    result = resolve(force="--force" in sys.argv)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+# direct_save.py
+# 브라우저 없이 임시저장: Selenium 로그인으로 얻은 쿠키를 그대로 실어 에디터의 저장 요청을 HTTP로 직접 보냄
+#
+# ⚠️ 실험적 기능: 기본 요청/응답 형식("stand-in")은 bench/fake_naver.py의 /draft/save 형식이며
+#    실제 SmartEditor 저장 API 형식이 아님. 실제 서비스에 쓰려면 DIRECT_SAVE_FORMAT에 맞는 형식을 FORMATS에
+#    등록하거나 DirectSaver(payload_builder=..., validate=...)로 넘겨야 함
+#
+# NAVER_DRAFT_SAVE_URL이 비어 있으면 비활성(항상 브라우저 경로 사용)
+# 실패하면 호출 쪽에서 기존 write_post(브라우저) 경로로 자동 대체
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+import progress
+
+DRAFT_SAVE_URL = os.environ.get("NAVER_DRAFT_SAVE_URL", "")
+DIRECT_SAVE_TIMEOUT = float(os.environ.get("DIRECT_SAVE_TIMEOUT", 10))
+DIRECT_POOL_SIZE = int(os.environ.get("DIRECT_POOL_SIZE", 10))        # 호스트당 유지할 keep-alive 연결 수
+DIRECT_MAX_SESSIONS = int(os.environ.get("DIRECT_MAX_SESSIONS", 100))  # 사용자별 HTTP 세션 보관 개수
+DIRECT_SAVE_FORMAT = os.environ.get("DIRECT_SAVE_FORMAT", "stand-in")  # 저장 요청/응답 형식(FORMATS의 키)
+
+ENGINES = ("browser", "direct")
+
+
+class DirectSaveError(Exception):
+    """저장 요청이 실패했거나 응답 검증(isSuccess)을 통과하지 못했을 때"""
+
+
+PayloadBuilder = Callable[[str, str], dict]    # (제목, 본문) → 요청 JSON
+ResponseValidator = Callable[[dict], None]       # 응답 JSON 검증, 실패면 DirectSaveError
+
+
+def build_payload(title: str, body: str) -> dict:
+    """stand-in 형식의 저장 요청 본문 (bench/fake_naver.py의 /draft/save가 받는 형식)"""
+    return {"title": title, "body": body}
+
+
+def validate_response(data) -> None:
+    """stand-in 형식의 응답 검증: {"isSuccess": true}"""
+    if not isinstance(data, dict) or data.get("isSuccess") is not True:
+        raise DirectSaveError(f"저장 응답 검증 실패: {str(data)[:200]}")
+
+
+# 형식 이름 → (요청 본문 생성, 응답 검증). 실제 에디터 형식은 확인되는 대로 여기에 추가
+FORMATS: Dict[str, Tuple[PayloadBuilder, ResponseValidator]] = {
+    "stand-in": (build_payload, validate_response),
+}
+
+
+class DirectSaver:
+    """사용자별 requests.Session(연결 재사용)으로 저장 요청을 보내는 클라이언트
+
+    세션을 사용자별로 나누는 이유: 응답의 Set-Cookie가 다른 사용자 요청에 섞이지 않도록
+    payload_builder/validate를 주지 않으면 fmt(기본 DIRECT_SAVE_FORMAT) 형식을 사용
+    """
+
+    def __init__(self, save_url: str = DRAFT_SAVE_URL, timeout: float = DIRECT_SAVE_TIMEOUT,
+                 max_sessions: int = DIRECT_MAX_SESSIONS, fmt: str = DIRECT_SAVE_FORMAT,
+                 payload_builder: Optional[PayloadBuilder] = None,
+                 validate: Optional[ResponseValidator] = None):
+        if fmt not in FORMATS:
+            raise ValueError(f"알 수 없는 저장 형식: {fmt} (가능: {', '.join(FORMATS)})")
+        self.save_url = save_url
+        self.timeout = timeout
+        self.max_sessions = max_sessions
+        self.format = fmt if payload_builder is None and validate is None else "custom"
+        self.payload_builder = payload_builder or FORMATS[fmt][0]
+        self.validate = validate or FORMATS[fmt][1]
+        self._sessions: "OrderedDict[str, requests.Session]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.save_url)
+
+    def _session(self, user_id: str) -> requests.Session:
+        with self._lock:
+            session = self._sessions.get(user_id)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=DIRECT_POOL_SIZE, pool_maxsize=DIRECT_POOL_SIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[user_id] = session
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)[1].close()
+            self._sessions.move_to_end(user_id)
+            return session
+
+    def save(self, user_id: str, cookies: List[dict], title: str, body: str) -> dict:
+        """쿠키(CDP Network.getAllCookies 형식)로 저장 요청 → 검증된 응답 JSON"""
+        if not self.enabled:
+            raise DirectSaveError("NAVER_DRAFT_SAVE_URL이 설정되지 않았습니다.")
+        session = self._session(user_id)
+        session.cookies.clear()
+        for c in cookies:
+            session.cookies.set(c["name"], c["value"], domain=c.get("domain", ""), path=c.get("path", "/"))
+
+        # 로그인이 풀렸으면 로그인 페이지로 리다이렉트되므로 따라가지 않고 실패로 처리
+        res = session.post(self.save_url, json=self.payload_builder(title, body),
+                           timeout=self.timeout, allow_redirects=False)
+        if res.status_code != 200:
+            raise DirectSaveError(f"저장 요청 실패 (HTTP {res.status_code})")
+        try:
+            data = res.json()
+        except ValueError:
+            raise DirectSaveError("저장 응답이 JSON이 아닙니다.")
+        self.validate(data)
+        return data
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+default_saver = DirectSaver()
+
+
+def save_post(user_id: str, cookies: Optional[List[dict]], title: str, body: str,
+              saver: DirectSaver = None) -> bool:
+    """direct 경로로 글 하나 저장 시도 → 성공 여부 (실패는 예외 대신 False, 호출 쪽이 브라우저로 대체)"""
+    saver = saver or default_saver
+    if not saver.enabled or not cookies:
+        metrics.DIRECT_SAVES_TOTAL.inc(result="skipped")
+        return False
+    started = time.perf_counter()
+    try:
+        with metrics.PHASE_SECONDS.time(phase="direct_save"):
+            saver.save(user_id, cookies, title, body)
+    except (DirectSaveError, requests.RequestException) as e:
+        metrics.DIRECT_SAVES_TOTAL.inc(result="fallback")
+        progress.emit("direct_fallback", f"⚠️ 직접 저장 실패, 브라우저로 작성합니다: {e}", error=str(e))
+        return False
+    metrics.DIRECT_SAVES_TOTAL.inc(result="ok")
+    metrics.POSTS_TOTAL.inc(confirmed="true")
+    progress.emit("direct_saved", "⚡ 브라우저 없이 임시저장 완료", seconds=round(time.perf_counter() - started, 3))
+    return True
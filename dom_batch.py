@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+# dom_batch.py
+# 여러 번의 find_element/click/scroll 명령을 execute_script 한 번으로 묶어 WebDriver 왕복 횟수를 줄임
+# 각 함수는 줄인 왕복 수를 metrics.ROUND_TRIPS_SAVED{op=...}에 기록하고 결과에도 담아 돌려줌
+
+import os
+from typing import Dict, List, Optional, Tuple
+
+from selenium import webdriver
+from selenium.common.exceptions import ElementClickInterceptedException
+from selenium.webdriver.remote.webelement import WebElement
+
+import metrics
+import waits
+from waits import StepWait, wait_quietly
+
+CLOSE_MAX_PASSES = int(os.environ.get("CLOSE_MAX_PASSES", 10))  # 차례로 뜨는 패널을 닫을 최대 반복 수
+CLOSE_APPEAR_GRACE = float(os.environ.get("CLOSE_APPEAR_GRACE", 1.0))  # 다음 패널이 뜨기를 기다리는 시간(초)
+
+# 보이는 요소만: position:fixed 요소는 offsetParent가 null이므로 getClientRects로 판단
+_VISIBLE_JS = "function visible(el) { return !!el && el.getClientRects().length > 0; }"
+
+LOCATE_JS = _VISIBLE_JS + """
+var selectors = arguments[0], required = arguments[1], out = {};
+for (var name in selectors) {
+  var el = document.querySelector(selectors[name]);
+  if (required.indexOf(name) >= 0 && !visible(el)) return null;
+  out[name] = el;
+}
+if (arguments[2]) out[arguments[2]].focus();
+return out;
+"""
+
+FIRST_VISIBLE_JS = _VISIBLE_JS + """
+var selectors = arguments[0];
+for (var name in selectors) {
+  var el = document.querySelector(selectors[name]);
+  if (visible(el)) return [name, el];
+}
+return null;
+"""
+
+CLICK_ALL_JS = _VISIBLE_JS + """
+var clicked = [];
+document.querySelectorAll(arguments[0]).forEach(function (btn) {
+  if (visible(btn)) { btn.click(); clicked.push(btn); }
+});
+return clicked;
+"""
+
+SCROLL_CENTER_JS = "arguments[0].scrollIntoView({block: 'center'});"
+JS_CLICK_JS = "arguments[0].click();"
+
+
+def _saved(op: str, count: int) -> int:
+    if count > 0:
+        metrics.ROUND_TRIPS_SAVED.inc(count, op=op)
+    return count
+
+
+def locate(driver: webdriver.Chrome, selectors: Dict[str, str], required: Optional[List[str]] = None,
+           focus: Optional[str] = None) -> Optional[Dict[str, Optional[WebElement]]]:
+    """이름 → CSS 선택자를 한 번에 찾음(focus가 주어지면 그 요소에 포커스까지)
+
+    required의 요소 중 하나라도 없거나 안 보이면 None. 기존 방식(요소마다 find_element, 포커스용 click) 대비
+    줄인 왕복 수를 기록
+    """
+    found = driver.execute_script(LOCATE_JS, selectors, required or [], focus)
+    if found is not None:
+        _saved("locate", len(selectors) - 1 + (1 if focus else 0))
+    return found
+
+
+def wait_for(wait: StepWait, selectors: Dict[str, str], step: str, required: Optional[List[str]] = None,
+             focus: Optional[str] = None) -> Dict[str, Optional[WebElement]]:
+    """required 요소가 모두 보일 때까지 기다리며 한 번의 쿼리로 전부 찾음 (요소별 대기를 하나로)"""
+    required = list(selectors) if required is None else required
+    return wait.until(lambda d: locate(d, selectors, required, focus), step=step)
+
+
+def wait_for_any(wait: StepWait, selectors: Dict[str, str], step: str) -> Tuple[str, WebElement]:
+    """selectors 중 하나라도 보일 때까지 대기 → (이름, 요소), 여러 개가 보이면 앞에 적은 것 우선
+
+    어느 쪽이 뜰지 모르는 요소(예: 팝업 또는 에디터)를 하나의 대기로 경합시켜,
+    뜨지 않는 쪽을 시간 초과까지 기다리지 않도록 함
+    """
+    return tuple(wait.until(lambda d: d.execute_script(FIRST_VISIBLE_JS, selectors), step=step))
+
+
+class LocatedElements:
+    """처음 필요할 때 한 번의 쿼리로 전부 찾아 두고 재사용 (프레임 재진입 등 후에는 invalidate)"""
+
+    def __init__(self, wait: StepWait, selectors: Dict[str, str], step: str, required: Optional[List[str]] = None):
+        self.wait = wait
+        self.selectors = selectors
+        self.step = step
+        self.required = required
+        self._found: Optional[Dict[str, Optional[WebElement]]] = None
+
+    def __getitem__(self, name: str) -> Optional[WebElement]:
+        if self._found is None:
+            self._found = wait_for(self.wait, self.selectors, self.step, self.required)
+        return self._found[name]
+
+    def invalidate(self):
+        self._found = None
+
+
+def close_all(driver: webdriver.Chrome, wait: StepWait, selector: str, step: str, max_passes: int = CLOSE_MAX_PASSES,
+              appear_grace: float = CLOSE_APPEAR_GRACE) -> dict:
+    """보이는 닫기 버튼을 한 번에 모두 클릭 → 닫힐 때까지 대기, 를 더 이상 없을 때까지 반복
+
+    패널은 팝업이 닫히거나 앞 패널을 닫은 뒤 조금 늦게 뜨기도 하므로, 보이는 버튼이 없으면
+    appear_grace초 동안 새 버튼이 뜨는지 더 기다린 뒤에 끝냄
+    기존: 패널마다 (find_element, click, 닫힘 확인) 3번 + 마지막 실패한 find_element 1번
+    """
+    closed = passes = trips = 0
+    for _ in range(max_passes):
+        clicked = driver.execute_script(CLICK_ALL_JS, selector) or []
+        passes += 1
+        trips += 1
+        if not clicked:
+            appeared = appear_grace > 0 and wait_quietly(
+                wait, lambda d: d.execute_script(FIRST_VISIBLE_JS, {"close": selector}),
+                f"{step}_appear", timeout=appear_grace, adaptive=False,
+            )
+            trips += 1
+            if not appeared:
+                break
+            continue
+        closed += len(clicked)
+        wait_quietly(wait, waits.elements_closed(clicked), step, timeout=2)
+        trips += 1
+    saved = _saved("close_all", 3 * closed + 1 - trips)
+    return {"closed": closed, "passes": passes, "round_trips_saved": saved}
+
+
+def scroll_and_click(driver: webdriver.Chrome, element: WebElement, target: str = "") -> dict:
+    """가운데로 스크롤 → 네이티브 클릭, 다른 요소에 가려져 클릭이 막힐 때만 JS 클릭으로 대체
+
+    기존: scrollIntoView, 화면 안에 들어왔는지 확인(1번 이상), click(가려지면 JS click 1번 더)
+    scrollIntoView는 동기적으로 끝나므로 화면 안 확인 대기만 뺌
+    """
+    driver.execute_script(SCROLL_CENTER_JS, element)
+    intercepted = False
+    try:
+        element.click()
+    except ElementClickInterceptedException:
+        intercepted = True
+        metrics.CLICK_INTERCEPTED.inc(target=target or "unknown")
+        driver.execute_script(JS_CLICK_JS, element)
+    saved = _saved("scroll_and_click", 1)
+    return {"intercepted": intercepted, "round_trips_saved": saved}
@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+# jobs.py
+# 자동화 작업(job) 관리: 요청은 job id만 받고 바로 반환, 실행은 제한된 워커 스레드에서 처리
+# 대기열은 사용자별 라운드로빈이고, 메모리/브라우저 수가 허락할 때만 다음 작업을 시작
+
+import os
+import json
+import time
+import uuid
+import asyncio
+import hashlib
+import threading
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+import metrics
+from scheduler import (
+    ADMISSION_POLL,
+    JOB_QUEUE_MAX,
+    USER_MAX_CONCURRENT,
+    USER_MAX_QUEUED,
+    FairQueue,
+    QueueFull,
+)
+
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+JOB_TIMEOUT = float(os.environ.get("JOB_TIMEOUT", 300))         # 작업 하나의 최대 실행 시간(초)
+JOB_RESULT_TTL = float(os.environ.get("JOB_RESULT_TTL", 3600))  # 끝난 작업 보관 시간(초)
+JOB_EVENT_BUFFER = int(os.environ.get("JOB_EVENT_BUFFER", 200))  # 작업별로 보관하는 진행 이벤트 수
+IDEMPOTENCY_TTL = float(os.environ.get("IDEMPOTENCY_TTL", 600))  # 같은 멱등성 키에 이전 결과를 돌려주는 시간(초)
+JOB_WATCHDOG_INTERVAL = float(os.environ.get("JOB_WATCHDOG_INTERVAL", 1))  # 실행 중 작업의 취소/시간 초과 확인 주기(초)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TIMED_OUT = "timed_out"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED, TIMED_OUT)
+
+
+class JobCancelled(Exception):
+    """사용자가 작업을 취소했을 때"""
+
+
+class JobTimedOut(Exception):
+    """작업이 JOB_TIMEOUT을 넘겼을 때"""
+
+
+class IdempotencyConflict(Exception):
+    """같은 멱등성 키로 내용이 다른 요청이 들어왔을 때"""
+
+
+def fingerprint(user_id: str, params: dict) -> str:
+    """요청 내용(사용자 + 파라미터)의 해시: 진행 중인 동일 요청을 합치는 데 사용"""
+    raw = json.dumps({"user_id": user_id, "params": params}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class Job:
+    """작업 하나의 상태와 결과"""
+
+    def __init__(self, user_id: str, params: dict, timeout: float = JOB_TIMEOUT):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.params = params
+        self.timeout = timeout
+        self.fingerprint = fingerprint(user_id, params)
+        self.idempotency_key: Optional[str] = None
+        self.status = QUEUED
+        self.phase: Optional[str] = None
+        self.result: Optional[dict] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._cancel = threading.Event()
+        # 워치독이 중단시킨 이유(CANCELLED/TIMED_OUT)와 그때 실행할 정리 함수(빌린 브라우저 종료 등)
+        self.abort_reason: Optional[str] = None
+        self._abort_hooks: List[Callable[[], None]] = []
+        self._abort_lock = threading.Lock()
+        # 진행 이벤트: 최근 JOB_EVENT_BUFFER개만 보관하고 구독자(SSE)에게 알림
+        self.events = deque(maxlen=JOB_EVENT_BUFFER)
+        self._seq = 0
+        self._events_lock = threading.Lock()
+        self._subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def request_cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    def overdue(self) -> bool:
+        return bool(self.started_at) and time.time() - self.started_at > self.timeout
+
+    def report(self, phase: str):
+        """자동화 단계가 바뀔 때마다 호출: 취소/시간 초과를 여기서 감지해 작업을 중단"""
+        self.phase = phase
+        if self.cancel_requested:
+            raise JobCancelled("작업이 취소되었습니다.")
+        if self.overdue():
+            raise JobTimedOut(f"실행 시간 초과 ({self.timeout:g}초)")
+
+    @contextmanager
+    def abort_hook(self, hook: Callable[[], None]):
+        """with 블록 안에서 작업이 중단되면 hook() 실행 (예: 멈춘 WebDriver 호출을 끊도록 브라우저 종료)
+
+        블록을 나갈 때 진행 중인 hook이 끝나기를 기다린 뒤 해제하므로,
+        반납된 브라우저가 다른 작업에 빌려진 뒤에 종료되는 일은 없음
+        """
+        with self._abort_lock:
+            self._abort_hooks.append(hook)
+            aborted = self.abort_reason is not None
+        if aborted:
+            self._run_hook(hook)
+        try:
+            yield
+        finally:
+            with self._abort_lock:
+                self._abort_hooks.remove(hook)
+
+    def abort(self, reason: str):
+        """워치독에서 호출: 다음 report()를 기다리지 않고 등록된 hook으로 실행 중인 호출을 끊음"""
+        with self._abort_lock:
+            if self.abort_reason is not None:
+                return
+            self.abort_reason = reason
+            for hook in list(self._abort_hooks):
+                self._run_hook(hook)
+
+    def _run_hook(self, hook: Callable[[], None]):
+        try:
+            hook()
+        except Exception as e:
+            print(f"⚠️ 작업 {self.id} 중단 처리 실패: {e}")
+
+    # ---- 진행 이벤트 ----
+    def add_event(self, phase: str, message: str = "", data: Optional[dict] = None):
+        """워커 스레드에서 호출(progress.bind의 sink)"""
+        with self._events_lock:
+            self._seq += 1
+            self.events.append({
+                "seq": self._seq,
+                "ts": time.time(),
+                "phase": phase,
+                "message": message,
+                "data": data or {},
+            })
+            subscribers = list(self._subscribers)
+        for loop, event in subscribers:
+            loop.call_soon_threadsafe(event.set)
+
+    def events_after(self, seq: int) -> Tuple[List[dict], int]:
+        """seq 이후 이벤트와, 버퍼가 넘쳐 놓친 이벤트 수를 반환"""
+        with self._events_lock:
+            events = [e for e in self.events if e["seq"] > seq]
+            first = events[0]["seq"] if events else self._seq + 1
+            return events, max(0, first - seq - 1)
+
+    def subscribe(self) -> asyncio.Event:
+        """이벤트 루프 안에서 호출: 새 이벤트가 생기면 set되는 asyncio.Event 반환"""
+        event = asyncio.Event()
+        with self._events_lock:
+            self._subscribers.append((asyncio.get_running_loop(), event))
+        return event
+
+    def unsubscribe(self, event: asyncio.Event):
+        with self._events_lock:
+            self._subscribers = [s for s in self._subscribers if s[1] is not event]
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "user_id": self.user_id,
+            "status": self.status,
+            "phase": self.phase,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    """작업 큐와 워커 스레드 풀
+
+    admission(running) → bool: 지금 작업을 하나 더 시작해도 되는지(scheduler.AdmissionController)
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[Job], dict],
+        workers: int = JOB_WORKERS,
+        result_ttl: float = JOB_RESULT_TTL,
+        admission: Optional[Callable[[int], bool]] = None,
+        queue_max: int = JOB_QUEUE_MAX,
+        user_max_queued: int = USER_MAX_QUEUED,
+        user_max_concurrent: int = USER_MAX_CONCURRENT,
+    ):
+        self.runner = runner
+        self.workers = workers
+        self.result_ttl = result_ttl
+        self.admission = admission or (lambda running: True)
+        self.queue_max = queue_max
+        self.user_max_queued = user_max_queued
+        self.user_max_concurrent = user_max_concurrent
+        self._jobs: Dict[str, Job] = {}
+        # 중복 요청 합치기: 멱등성 키 → 작업, 요청 내용 해시 → 진행 중인 작업
+        self._by_key: Dict[str, Job] = {}
+        self._inflight: Dict[str, Job] = {}
+        self._queue = FairQueue()
+        self._running_by_user: Counter = Counter()
+        self._durations = deque(maxlen=20)  # Retry-After 추정용 최근 실행 시간
+        self._cond = threading.Condition()
+        self._threads = []
+        self._stopped = False
+
+    def start(self):
+        for i in range(self.workers):
+            t = threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        t = threading.Thread(target=self._watchdog, name="job-watchdog", daemon=True)
+        t.start()
+        self._threads.append(t)
+
+    def shutdown(self):
+        with self._cond:
+            self._stopped = True
+            for job in self._queue:
+                self._finish(job, CANCELLED, error="서버 종료로 취소되었습니다.")
+            self._queue.clear()
+            self._cond.notify_all()
+
+    # ---- 외부 API ----
+    def submit(self, user_id: str, params: dict, timeout: float = JOB_TIMEOUT) -> Job:
+        """대기열에 작업 등록. 전체/사용자별 대기 한도를 넘으면 QueueFull"""
+        job = Job(user_id, params, timeout)
+        with self._cond:
+            self._prune()
+            if len(self._queue) >= self.queue_max:
+                raise QueueFull("대기 중인 작업이 너무 많습니다.", self._retry_after(len(self._queue), self.workers))
+            if self._queue.user_len(user_id) >= self.user_max_queued:
+                raise QueueFull(
+                    f"사용자별 대기 한도({self.user_max_queued}개)를 넘었습니다.",
+                    self._retry_after(self._queue.user_len(user_id), self.user_max_concurrent),
+                )
+            self._jobs[job.id] = job
+            self._queue.push(job)
+            self._cond.notify_all()
+        return job
+
+    def submit_once(
+        self,
+        user_id: str,
+        params: dict,
+        idempotency_key: Optional[str] = None,
+        timeout: float = JOB_TIMEOUT,
+    ) -> Tuple[Job, bool]:
+        """중복 요청이면 기존 작업을, 아니면 새 작업을 반환 → (작업, 중복 여부)
+
+        - 같은 내용의 요청이 대기/실행 중이면 그 작업에 합류(single-flight)
+        - 멱등성 키가 같으면 IDEMPOTENCY_TTL 동안 성공한 결과를 그대로 돌려줌
+          (실패/취소된 작업은 다시 실행, 키는 같은데 내용이 다르면 IdempotencyConflict)
+        """
+        key = f"{user_id}:{idempotency_key}" if idempotency_key else None
+        digest = fingerprint(user_id, params)
+        with self._cond:
+            self._prune()
+            existing = self._by_key.get(key) if key else None
+            if existing is not None:
+                if existing.fingerprint != digest:
+                    raise IdempotencyConflict("같은 멱등성 키로 다른 내용의 요청이 들어왔습니다.")
+                if not existing.finished or existing.status == SUCCEEDED:
+                    metrics.JOBS_COALESCED.inc(kind="cached" if existing.finished else "inflight")
+                    return existing, True
+            existing = self._inflight.get(digest)
+            if existing is not None and not existing.finished:
+                metrics.JOBS_COALESCED.inc(kind="inflight")
+                if key:
+                    self._by_key[key] = existing
+                return existing, True
+
+            job = self.submit(user_id, params, timeout)
+            job.idempotency_key = key
+            self._inflight[digest] = job
+            if key:
+                self._by_key[key] = job
+            return job, False
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """대기 중이면 즉시 취소, 실행 중이면 워치독이 브라우저를 끊어 중단(다음 단계 경계를 기다리지 않음)"""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return job
+            job.request_cancel()
+            if job.status == QUEUED:
+                self._queue.remove(job)
+                self._finish(job, CANCELLED, error="작업이 취소되었습니다.")
+            return job
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "queued": len(self._queue),
+                "running": sum(self._running_by_user.values()),
+                "queued_by_user": self._queue.by_user(),
+                "running_by_user": {u: n for u, n in self._running_by_user.items() if n},
+                "queue_max": self.queue_max,
+                "user_max_concurrent": self.user_max_concurrent,
+                "idempotency_keys": len(self._by_key),
+            }
+
+    # ---- 내부 ----
+    def _retry_after(self, jobs_ahead: int, parallel: int) -> int:
+        """앞선 작업 수와 최근 평균 실행 시간으로 재시도까지 기다릴 시간(초) 추정"""
+        average = sum(self._durations) / len(self._durations) if self._durations else 60
+        return max(1, int(average * jobs_ahead / max(1, parallel)))
+
+    def _next_job(self) -> Optional[Job]:
+        """사용자별 동시 실행 한도 안에서, 입장 제어가 허락하면 다음 작업을 꺼냄(락 안에서 호출)"""
+        if not self._queue:
+            return None
+        if not self.admission(sum(self._running_by_user.values())):
+            return None
+        return self._queue.pop_next(lambda user_id: self._running_by_user[user_id] < self.user_max_concurrent)
+
+    def _finish(self, job: Job, status: str, result: Optional[dict] = None, error: Optional[str] = None):
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        job.add_event("finished", error or "", {"status": status})
+        metrics.JOBS_TOTAL.inc(status=status)
+
+    def _prune(self):
+        """보관 시간이 지난 완료 작업과 만료된 멱등성 키 정리"""
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and now - job.finished_at > self.result_ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+        for key, job in list(self._by_key.items()):
+            if job.finished and now - job.finished_at > IDEMPOTENCY_TTL:
+                del self._by_key[key]
+        for digest, job in list(self._inflight.items()):
+            if job.finished:
+                del self._inflight[digest]
+
+    def _watchdog(self):
+        """실행 중인 작업의 취소 요청/시간 초과를 주기적으로 확인해 job.abort() 호출
+
+        report()는 단계 경계에서만 불리므로, WebDriver 호출 하나가 멈추면 그것만으로는 끝나지 않음
+        """
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                running = [j for j in self._jobs.values() if j.status == RUNNING and j.abort_reason is None]
+            for job in running:
+                if job.cancel_requested:
+                    print(f"🛑 작업 {job.id} 취소: 실행 중인 브라우저를 중단합니다.")
+                    job.abort(CANCELLED)
+                elif job.overdue():
+                    print(f"⏱️ 작업 {job.id} 시간 초과: 실행 중인 브라우저를 중단합니다.")
+                    job.abort(TIMED_OUT)
+            time.sleep(JOB_WATCHDOG_INTERVAL)
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped:
+                        return
+                    job = self._next_job()
+                    if job is not None:
+                        break
+                    # 대기열이 비었으면 새 작업까지, 입장이 거부됐으면 잠시 뒤 다시 확인
+                    self._cond.wait(ADMISSION_POLL if self._queue else None)
+                self._running_by_user[job.user_id] += 1
+                job.status = RUNNING
+                job.started_at = time.time()
+            metrics.JOB_QUEUE_SECONDS.observe(job.started_at - job.created_at)
+
+            try:
+                result = self.runner(job)
+                outcome = (SUCCEEDED, result, None)
+            except JobCancelled as e:
+                outcome = (CANCELLED, None, str(e))
+            except JobTimedOut as e:
+                outcome = (TIMED_OUT, None, str(e))
+            except Exception as e:
+                # 워치독이 브라우저를 끊어서 난 예외면 원래 이유(취소/시간 초과)로 기록
+                if job.abort_reason == CANCELLED:
+                    outcome = (CANCELLED, None, "작업이 취소되었습니다.")
+                elif job.abort_reason == TIMED_OUT:
+                    outcome = (TIMED_OUT, None, f"실행 시간 초과 ({job.timeout:g}초)")
+                else:
+                    outcome = (FAILED, None, str(e))
+
+            with self._cond:
+                self._finish(job, *outcome)
+                self._running_by_user[job.user_id] -= 1
+                self._durations.append(job.finished_at - job.started_at)
+                self._cond.notify_all()  # 이 사용자의 다음 작업/입장 대기 중인 작업이 시작될 수 있음
+            metrics.JOB_SECONDS.observe(job.finished_at - job.started_at)
+            print(f"📦 작업 {job.id} 종료: {job.status}")
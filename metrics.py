@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+# metrics.py
+# 단계별 지연 시간/성공·실패 횟수/Chrome 프로세스·메모리 지표를 모아 Prometheus 텍스트 형식으로 내보냄
+
+import os
+import time
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, List, Tuple
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+_registry: List["_Metric"] = []
+
+
+def _label_key(labels: dict) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        return "\n".join(lines + self.samples())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [f"{self.name}{_format_labels(k)} {v}" for k, v in self._values.items()]
+
+
+class Gauge(_Metric):
+    """값을 직접 set하거나, 수집 시점에 callback으로 계산"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, callback: Callable[[], float] = None):
+        super().__init__(name, help_text)
+        self.callback = callback
+        self._values: Dict[tuple, float] = {}
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def samples(self):
+        if self.callback is not None:
+            try:
+                return [f"{self.name} {self.callback()}"]
+            except Exception:
+                return []
+        with self._lock:
+            return [f"{self.name}{_format_labels(k)} {v}" for k, v in self._values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(buckets)
+        self._values: Dict[tuple, list] = {}  # key -> [버킷별 개수..., 합계, 개수]
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            state = self._values.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        lines = []
+        with self._lock:
+            for key, state in self._values.items():
+                for bound, count in zip(self.buckets, state):
+                    le = 'le="%s"' % bound
+                    lines.append(f"{self.name}_bucket{_format_labels(key, le)} {count}")
+                inf = 'le="+Inf"'
+                lines.append(f"{self.name}_bucket{_format_labels(key, inf)} {state[-1]}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {state[-2]}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {state[-1]}")
+        return lines
+
+
+def render() -> str:
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+# ---- 프로세스/메모리 (/proc 기반, Render 리눅스 환경) ----
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _rss_bytes(pid) -> int:
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def chrome_processes() -> List[int]:
+    """이름에 chrome이 들어간 프로세스(chrome, chromedriver 포함) pid 목록"""
+    pids = []
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return pids
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/comm") as f:
+                if "chrom" in f.read():
+                    pids.append(int(entry))
+        except OSError:
+            continue
+    return pids
+
+
+# ---- 자동화 지표 ----
+PHASE_SECONDS = Histogram("naver_phase_duration_seconds", "자동화 단계별 소요 시간")
+JOB_QUEUE_SECONDS = Histogram("naver_job_queue_wait_seconds", "작업 등록부터 워커 시작까지 대기 시간")
+JOB_SECONDS = Histogram("naver_job_duration_seconds", "작업 실행 시간(브라우저 대여 포함)")
+BROWSER_LEASE_SECONDS = Histogram("naver_browser_lease_seconds", "브라우저 풀에서 드라이버를 빌리는 데 걸린 시간")
+JOBS_TOTAL = Counter("naver_jobs_total", "상태별 종료된 작업 수")
+JOBS_COALESCED = Counter("naver_jobs_coalesced_total", "중복 요청을 기존 작업(진행 중/캐시된 결과)으로 합친 횟수")
+PHASE_RETRIES = Counter("naver_phase_retries_total", "체크포인트 단계별 재시도 횟수(실패 원인 예외별)")
+WAIT_TIMEOUTS = Counter("naver_wait_timeouts_total", "단계별 대기 시간 초과 횟수")
+POSTS_TOTAL = Counter("naver_posts_total", "저장 완료 토스트 확인 여부별 작성한 글 수")
+BLOCKED_REQUESTS = Counter("naver_blocked_requests_total", "리소스 차단 프로필로 막은 요청 수")
+BLOCKED_BYTES = Counter("naver_blocked_bytes_estimated_total", "차단으로 아낀 다운로드 바이트(리소스 종류별 평균으로 추정)")
+DIRECT_SAVES_TOTAL = Counter("naver_direct_saves_total", "direct 엔진 저장 결과(ok/fallback/skipped)별 횟수")
+ROUND_TRIPS_SAVED = Counter("naver_webdriver_round_trips_saved_total", "DOM 명령 묶음(dom_batch)으로 줄인 WebDriver 왕복 수")
+CLICK_INTERCEPTED = Counter("naver_click_intercepted_total", "ElementClickInterceptedException으로 JS 클릭 대체한 횟수")
+Gauge("naver_chrome_processes", "실행 중인 Chrome/ChromeDriver 프로세스 수", lambda: len(chrome_processes()))
+Gauge("naver_chrome_resident_memory_bytes", "Chrome/ChromeDriver 프로세스 RSS 합계",
+      lambda: sum(_rss_bytes(pid) for pid in chrome_processes()))
+Gauge("process_resident_memory_bytes", "API 서버 프로세스 RSS", lambda: _rss_bytes("self"))
+
+
+def timed(phase: str):
+    """함수 실행 시간을 PHASE_SECONDS{phase=...}에 기록하는 데코레이터"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with PHASE_SECONDS.time(phase=phase):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -5,7 +5,7 @@
 import os
 import sys
 import time
-import pyperclip
+from typing import Callable, List, Optional
 
 # 한글 출력을 위한 설정
 if sys.stdout.encoding != 'utf-8':
@@ -16,27 +16,59 @@ if sys.stdout.encoding != 'utf-8':
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
-    ElementClickInterceptedException,
     TimeoutException,
     WebDriverException,
 )
-from webdriver_manager.chrome import ChromeDriverManager
+
+import checkpoints
+import chrome_resolver
+import direct_save
+import dom_batch
+import metrics
+import profile_template
+import progress
+import resource_blocking
+from text_input import default_engine as text_engine
+import waits
+from waits import StepWait, wait_quietly
 
 # 환경변수에서 네이버 로그인 정보 가져오기
 NAV_ID = os.getenv("NAVER_ID")
 NAV_PW = os.getenv("NAVER_PW")
-BLOG_WRITE_URL = "https://blog.naver.com/GoBlogWrite.naver"
-MODEL_WAIT = 15
+# 로컬 벤치마크(bench/fake_naver.py)에서는 가짜 사이트 주소로 바꿔서 실행
+NAVER_LOGIN_URL = os.getenv("NAVER_LOGIN_URL", "https://nid.naver.com/nidlogin.login")
+BLOG_WRITE_URL = os.getenv("BLOG_WRITE_URL", "https://blog.naver.com/GoBlogWrite.naver")
+MODEL_WAIT = waits.WAIT_DEFAULT  # 관측값이 쌓이기 전 기본 대기 시간(이후 단계별 p95 기반으로 조정)
+
+# 한 번의 쿼리로 함께 찾는 요소들
+LOGIN_FIELDS = {"id": "#id", "pw": "#pw", "login": "[id='log.login']"}
+EDITOR_ELEMENTS = {
+    "title": ".se-section-documentTitle",
+    "body": ".se-section-text",
+    "content": ".se-content",
+    "save": ".save_btn__bzc5B",
+}
+POPUP_CANCEL = ".se-popup-button-cancel"
+HELP_PANEL_CLOSE = ".se-help-panel-close-button"
+
+@metrics.timed("init_driver")
+def init_driver(user_data_dir: Optional[str] = None) -> webdriver.Chrome:
+    """ChromeDriver 초기화(브라우저 자동 종료 방지)
 
-def init_driver() -> webdriver.Chrome:
-    """ChromeDriver 초기화(브라우저 자동 종료 방지)"""
+    user_data_dir를 주지 않으면 데워 둔 프로필 템플릿의 복제본으로 실행(없으면 빈 프로필)
+    복제본은 driver.profile_dir에 기록되며 quit_driver()가 종료 후 삭제
+    """
     opts = Options()
+    chrome = chrome_resolver.resolve()
+    profile_dir = None
+    if user_data_dir is None:
+        user_data_dir = profile_dir = profile_template.clone()
+    if user_data_dir:
+        opts.add_argument(f"--user-data-dir={user_data_dir}")
     
     # Render 환경 감지 및 헤드리스 설정
     if os.environ.get('RENDER') or os.environ.get('DISPLAY'):
@@ -46,48 +78,20 @@ def init_driver() -> webdriver.Chrome:
         opts.add_argument('--disable-dev-shm-usage')
         opts.add_argument('--disable-gpu')
         opts.add_argument('--disable-extensions')
-        opts.add_argument('--remote-debugging-port=9222')
+        # 브라우저 풀에서 여러 Chrome을 동시에 띄우므로 고정 디버깅 포트(9222)는 사용하지 않음
         opts.add_argument('--disable-background-timer-throttling')
         opts.add_argument('--disable-backgrounding-occluded-windows')
         opts.add_argument('--disable-renderer-backgrounding')
+        resource_blocking.enable_performance_log(opts)
         
-        # Chrome 바이너리 경로 동적 찾기
-        chrome_paths = [
-            '/usr/bin/google-chrome-stable',
-            '/usr/bin/google-chrome',
-            '/usr/bin/chromium-browser',
-            '/opt/google/chrome/chrome',
-            '/snap/bin/chromium',
-            '/usr/bin/chromium'
-        ]
-        
-        chrome_binary = None
-        for path in chrome_paths:
-            if os.path.exists(path):
-                chrome_binary = path
-                print(f"✅ Chrome 바이너리 발견: {path}")
-                break
-        
-        if not chrome_binary:
-            print("❌ Chrome 바이너리를 찾을 수 없습니다.")
-            # 시스템에서 chrome 찾기 시도
-            import subprocess
-            commands_to_try = ['google-chrome', 'google-chrome-stable', 'chromium-browser', 'chromium']
-            for cmd in commands_to_try:
-                try:
-                    result = subprocess.run(['which', cmd], capture_output=True, text=True)
-                    if result.returncode == 0:
-                        chrome_binary = result.stdout.strip()
-                        print(f"✅ which 명령으로 {cmd} 발견: {chrome_binary}")
-                        break
-                except:
-                    continue
-        
+        # Chrome 바이너리 경로 (빌드/첫 실행 때 만든 매니페스트 재사용)
+        chrome_binary = chrome["chrome_binary"]
         if chrome_binary:
+            print(f"✅ Chrome 바이너리: {chrome_binary} ({chrome.get('chrome_version') or '버전 미확인'})")
             opts.binary_location = chrome_binary
         else:
             print("❌ 어떤 Chrome 바이너리도 찾을 수 없습니다.")
-            print("🔄 ChromeDriverManager가 자동으로 처리하도록 시도합니다...")
+            print("🔄 ChromeDriver 기본 탐색에 맡깁니다...")
     else:
         print("💻 로컬 환경에서 GUI 모드로 실행합니다...")
         opts.add_experimental_option("detach", True)
@@ -100,123 +104,356 @@ def init_driver() -> webdriver.Chrome:
     
     try:
         driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()), 
+            service=Service(chrome["driver_path"]), 
             options=opts
         )
+        driver.profile_dir = profile_dir
         driver.set_window_size(1600, 950)
+        # 헤드리스 실행에서는 이미지/폰트/미디어/추적 스크립트를 받지 않음
+        if os.environ.get('RENDER') or os.environ.get('DISPLAY'):
+            resource_blocking.apply(driver)
         return driver
     except Exception as e:
+        profile_template.release(profile_dir)
         print(f"❌ Chrome 드라이버 초기화 실패: {str(e)}")
         raise
 
-def naver_login(driver: webdriver.Chrome) -> WebDriverWait:
-    """네이버 로그인 후 WebDriverWait 반환"""
-    print("🌐 네이버 로그인 페이지로 이동합니다...")
-    driver.get("https://nid.naver.com/nidlogin.login")
-    time.sleep(0.5)   # 페이지 로딩 대기시간
+def quit_driver(driver: webdriver.Chrome):
+    """Chrome 종료 후 이 실행에 쓴 프로필 복제본 삭제"""
+    try:
+        driver.quit()
+    finally:
+        profile_template.release(getattr(driver, "profile_dir", None))
+
+def warm_profile(user_data_dir: str):
+    """프로필 템플릿 만들기: 로그인 → 글쓰기 페이지까지 열어 SmartEditor 리소스를 캐시에 채운 뒤 종료
+
+    로그인 흔적은 종료 후 profile_template.scrub()이 지움. 계정 정보가 없으면 공개 페이지만 캐시
+    """
+    driver = init_driver(user_data_dir)
+    try:
+        if NAV_ID and NAV_PW:
+            wait = naver_login(driver)
+            open_write_page(driver, wait)
+        else:
+            driver.get(NAVER_LOGIN_URL)
+    finally:
+        driver.quit()
+
+def ensure_profile_template() -> bool:
+    return profile_template.ensure(warm_profile)
+
+@metrics.timed("naver_login")
+def naver_login(driver: webdriver.Chrome) -> StepWait:
+    """네이버 로그인 후 StepWait(WebDriverWait) 반환"""
+    wait = StepWait(driver, MODEL_WAIT)
+    progress.emit("login", "🌐 네이버 로그인 페이지로 이동합니다...")
+    driver.get(NAVER_LOGIN_URL)
+    # 입력창 2개와 버튼을 한 번에 찾고 ID 입력창에 포커스까지
+    fields = dom_batch.wait_for(wait, LOGIN_FIELDS, "login_form", focus="id")
 
     print("🔐 로그인 정보를 입력합니다...")
     
-    # ID 입력
-    driver.find_element(By.ID, "id").click()
-    pyperclip.copy(NAV_ID)
-    driver.find_element(By.ID, "id").send_keys(Keys.CONTROL, "v")
-    time.sleep(0.1)
-
-    # 비밀번호 입력
-    driver.find_element(By.ID, "pw").click()
-    pyperclip.copy(NAV_PW)
-    driver.find_element(By.ID, "pw").send_keys(Keys.CONTROL, "v")
-    pyperclip.copy("")  # 클립보드 비우기
-    time.sleep(0.1)
-
-    # 로그인 버튼 클릭
-    driver.find_element(By.ID, "log.login").click()
-    time.sleep(0.5)  # 로그인 완료 대기시간
-    
-    print("✅ 로그인 완료!")
-    return WebDriverWait(driver, MODEL_WAIT)
+    # ID/비밀번호 입력 (프로세스 전역 클립보드 대신 입력 엔진 사용 → 동시 작업 간 간섭 없음)
+    # 입력 엔진이 값을 다시 읽어 확인하므로 입력 후 고정 대기는 두지 않음
+    text_engine.insert(driver, fields["id"], NAV_ID)
+    driver.execute_script("arguments[0].focus();", fields["pw"])
+    text_engine.insert(driver, fields["pw"], NAV_PW)
 
-def open_write_page(driver: webdriver.Chrome, wait: WebDriverWait):
-    """블로그 글쓰기 페이지 접속 및 iframe 진입, 팝업/도움말 닫기"""
-    print("📝 블로그 글쓰기 페이지로 이동합니다...")
-    driver.get(BLOG_WRITE_URL)
+    # 로그인 버튼 클릭 후 로그인 페이지를 벗어날 때까지 대기
+    fields["login"].click()
+    if wait_quietly(wait, waits.login_redirect_complete(), "login_redirect"):
+        progress.emit("login_done", "✅ 로그인 완료!", restored=False)
+    else:
+        progress.emit(
+            "login_done", "⚠️ 로그인 후 페이지 이동을 확인할 수 없지만 계속 진행합니다.",
+            restored=False, confirmed=False
+        )
+    return wait
+
+@metrics.timed("open_write_page")
+def open_write_page(driver: webdriver.Chrome, wait: StepWait, navigate: bool = True):
+    """블로그 글쓰기 페이지 접속 및 iframe 진입, 팝업/도움말 닫기
+
+    navigate=False면 이미 글쓰기 페이지에 있다고 보고 이동을 생략(세션 복원 직후)
+    """
+    if navigate:
+        print("📝 블로그 글쓰기 페이지로 이동합니다...")
+        driver.get(BLOG_WRITE_URL)
 
     # 메인 프레임 전환
     print("🔄 메인 프레임으로 전환 중...")
-    wait.until(EC.frame_to_be_available_and_switch_to_it((By.CSS_SELECTOR, "iframe#mainFrame")))
+    wait.until(waits.main_frame_ready(), step="main_frame")
+    progress.emit("frame_switch", "🔄 메인 프레임으로 전환했습니다.")
 
-    # 이어쓰기 팝업 취소
-    try:
-        cancel_btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, ".se-popup-button-cancel")))
-        cancel_btn.click()
-        wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, ".se-popup-dim")))
-        print("📋 이어쓰기 팝업을 닫았습니다.")
-    except TimeoutException:
-        print("📋 이어쓰기 팝업이 없습니다.")
-
-    # 도움말 패널 닫기(존재할 때까지 반복)
-    help_closed = 0
-    while True:
-        try:
-            driver.find_element(By.CSS_SELECTOR, ".se-help-panel-close-button").click()
-            help_closed += 1
-            time.sleep(0.05)   # 루프 속도
-        except WebDriverException:
-            break
-    
-    if help_closed > 0:
-        print(f"❓ 도움말 패널 {help_closed}개를 닫았습니다.")
+    # 이어쓰기 팝업 취소 (딤이 사라진 뒤에 도움말 패널을 닫음)
+    # 팝업이 없는 경우 시간 초과까지 기다리지 않도록 팝업과 에디터 제목 중 먼저 보이는 쪽으로 판단
+    shown, element = dom_batch.wait_for_any(
+        wait, {"popup": POPUP_CANCEL, "editor": EDITOR_ELEMENTS["title"]}, "resume_popup"
+    )
+    if shown == "popup":
+        element.click()
+        wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, ".se-popup-dim")), step="resume_popup_close")
+        progress.emit("popup_close", "📋 이어쓰기 팝업을 닫았습니다.", closed=True)
+    else:
+        progress.emit("popup_close", "📋 이어쓰기 팝업이 없습니다.", closed=False)
 
-def write_post(driver: webdriver.Chrome, wait: WebDriverWait, title: str, body: str):
-    """제목과 본문 입력 후 저장"""
-    print(f"✏️ 블로그 포스트를 작성합니다...")
-    print(f"   제목: {title}")
-    print(f"   내용: {body}")
-    
-    actions = ActionChains(driver)
+    # 도움말 패널 닫기: 보이는 패널을 한 번에 닫고, 이어서 뜨는 패널이 없을 때까지 반복
+    panels = dom_batch.close_all(driver, wait, HELP_PANEL_CLOSE, "help_panel_close")
+    if panels["closed"] > 0:
+        progress.emit(
+            "help_close", f"❓ 도움말 패널 {panels['closed']}개를 닫았습니다.",
+            closed=panels["closed"], round_trips_saved=panels["round_trips_saved"]
+        )
+
+class SaveNotConfirmed(TimeoutException):
+    """저장 버튼을 눌렀지만 '저장됨' 토스트가 뜨지 않음(저장 단계 재시도 대상)"""
 
-    # 제목 입력
+def _reenter_editor(driver: webdriver.Chrome, wait: StepWait):
+    """재시도 전 복구: 기본 문서로 나왔다가 메인 프레임에 다시 들어감(페이지는 그대로)"""
+    driver.switch_to.default_content()
+    wait.until(waits.main_frame_ready(), step="main_frame")
+
+def _write_title(driver: webdriver.Chrome, editor: dom_batch.LocatedElements, title: str,
+                 attempt: int = 0, before: Optional[dict] = None):
     print("📝 제목 입력 중...")
-    title_area = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, ".se-section-documentTitle")))
-    actions.move_to_element(title_area).click().perform()
-    for ch in title:
-        actions.send_keys(ch).pause(0.0001)
-    actions.perform()
-    actions.reset_actions()
-
-    # 본문 입력
+    with metrics.PHASE_SECONDS.time(phase="write_post_title"):
+        title_area = editor["title"]
+        if _resumed(driver, title_area, title, "title", attempt, before):
+            return
+        ActionChains(driver).move_to_element(title_area).click().perform()
+        strategy = text_engine.insert(driver, title_area, title)
+    progress.emit("title_typed", f"   제목 입력 방식: {strategy}", strategy=strategy, chars=len(title))
+
+def _write_body(driver: webdriver.Chrome, editor: dom_batch.LocatedElements, body: str,
+                attempt: int = 0, before: Optional[dict] = None):
+    # 문단 단위 일괄 입력, 검증은 본문이 여러 컴포넌트로 나뉘어도 되도록 에디터 전체 기준
     print("📝 본문 입력 중...")
-    body_area = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, ".se-section-text")))
-    actions.move_to_element(body_area).click().perform()
-    for line in body.splitlines():
-        for ch in line:
-            actions.send_keys(ch).pause(0.0001)
-        actions.send_keys(Keys.ENTER).pause(0.0001)
-    actions.perform()
-
-    # 저장
+    with metrics.PHASE_SECONDS.time(phase="write_post_body"):
+        body_area = editor["body"]
+        target = editor["content"] or body_area
+        if _resumed(driver, target, body, "body", attempt, before):
+            return
+        ActionChains(driver).move_to_element(body_area).click().perform()
+        strategy = text_engine.insert(driver, target, body)
+    progress.emit("body_typed", f"   본문 입력 방식: {strategy}", strategy=strategy, chars=len(body))
+
+def _resumed(driver: webdriver.Chrome, target, text: str, name: str, attempt: int, before: Optional[dict]) -> bool:
+    """첫 시도면 입력 전 내용을 before[name]에 기록, 재시도면 이전 시도가 이미 다 입력했는지 확인
+
+    입력은 끝났는데 확인(다시 읽기) 중 StaleElement 등으로 실패한 경우 다시 입력하면 중복되므로 건너뜀
+    """
+    if before is None:
+        return False
+    if attempt == 0:
+        before[name] = text_engine.read(driver, target)
+        return False
+    if text_engine.already_inserted(driver, target, text, before.get(name)):
+        progress.emit(f"{name}_typed", f"   이전 시도에서 {name} 입력이 이미 끝났습니다.", strategy="resumed", chars=len(text))
+        return True
+    return False
+
+def _save_draft(driver: webdriver.Chrome, wait: StepWait, editor: dom_batch.LocatedElements):
     print("💾 임시저장 중...")
-    save_btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, ".save_btn__bzc5B")))
-    driver.execute_script("arguments[0].scrollIntoView({block:'center'});", save_btn)
-    time.sleep(0.05)    # 스크롤 안정화 시간
-    try:
-        save_btn.click()
-    except ElementClickInterceptedException:
-        driver.execute_script("arguments[0].click();", save_btn) 
-    
-    # '저장됨' 토스트 대기
+    with metrics.PHASE_SECONDS.time(phase="write_post_save"):
+        # 가운데로 스크롤 후 네이티브 클릭(가려져 막히면 JS 클릭으로 대체)
+        dom_batch.scroll_and_click(driver, editor["save"], target="save_button")
+        
+        # '저장됨' 토스트 대기 (토스트가 곧 저장 완료 신호이므로 추가 대기 없음)
+        if not wait_quietly(wait, waits.save_toast(), "save_toast"):
+            raise SaveNotConfirmed("저장 완료 토스트가 나타나지 않았습니다.")
+
+def write_post(
+    driver: webdriver.Chrome,
+    wait: StepWait,
+    title: str,
+    body: str,
+    checkpoint: Optional[checkpoints.Checkpoint] = None,
+    report: Optional[Callable[[str], None]] = None,
+):
+    """제목과 본문 입력 후 저장
+
+    제목/본문/저장은 각각 체크포인트 단계라 실패하면 그 단계만 (같은 드라이버에서) 다시 시도
+    저장 토스트는 재시도를 모두 써도 안 보이면 기존처럼 경고만 남기고 계속 진행
+    """
+    print(f"✏️ 블로그 포스트를 작성합니다...")
+    print(f"   제목: {title}")
+    print(f"   내용: {body}")
+    checkpoint = checkpoint or checkpoints.Checkpoint()
+    # 제목/본문/에디터 영역/저장 버튼은 처음 필요할 때 한 번의 쿼리로 모두 찾아 둠
+    editor = dom_batch.LocatedElements(wait, EDITOR_ELEMENTS, "editor_elements", required=["title", "body", "save"])
+
+    def recover():
+        editor.invalidate()
+        _reenter_editor(driver, wait)
+
+    # 재시도 때 중복 입력을 막기 위해 첫 시도 전의 제목/본문 내용을 기록해 둠
+    before: dict = {}
+    checkpoints.run(checkpoint, checkpoints.TITLE_WRITTEN,
+                    lambda attempt: _write_title(driver, editor, title, attempt, before), recover, report)
+    checkpoints.run(checkpoint, checkpoints.BODY_WRITTEN,
+                    lambda attempt: _write_body(driver, editor, body, attempt, before), recover, report)
     try:
-        wait.until(
-            EC.presence_of_element_located(
-                (By.CSS_SELECTOR, ".toast_item__success, .se-toast-item__success")
-            )
-        )
-        print("✅ 임시저장이 완료되었습니다!")
-    except TimeoutException:
-        print("⚠️ 저장 완료 메시지를 확인할 수 없지만 계속 진행합니다.")
-    
-    time.sleep(0.2) # 저장 대기시간
+        checkpoints.run(checkpoint, checkpoints.SAVED, lambda attempt: _save_draft(driver, wait, editor),
+                        recover, report)
+        confirmed = True
+    except SaveNotConfirmed:
+        confirmed = False
+    metrics.POSTS_TOTAL.inc(confirmed=str(confirmed).lower())
+    if confirmed:
+        progress.emit("save_toast", "✅ 임시저장이 완료되었습니다!", confirmed=True)
+    else:
+        progress.emit("save_toast", "⚠️ 저장 완료 메시지를 확인할 수 없지만 계속 진행합니다.", confirmed=False)
+
+def open_editor(
+    driver: webdriver.Chrome,
+    wait: StepWait,
+    checkpoint: checkpoints.Checkpoint,
+    navigate: bool = True,
+    report: Optional[Callable[[str], None]] = None,
+):
+    """에디터 열기 단계: 실패하면 기본 문서로 나와 글쓰기 페이지를 새로 열어 재시도"""
+    checkpoints.run(
+        checkpoint, checkpoints.EDITOR_OPEN,
+        lambda attempt: open_write_page(driver, wait, navigate=navigate or attempt > 0),
+        driver.switch_to.default_content, report,
+    )
+
+def login_or_restore(driver: webdriver.Chrome, user_id: str = "default", sessions=None):
+    """저장된 세션 복원을 먼저 시도하고 실패하면 naver_login → (wait, 복원 여부) 반환
+
+    복원에 성공하면 드라이버는 이미 글쓰기 페이지에 있음
+    """
+    if sessions is not None and sessions.restore(driver, user_id):
+        progress.emit("login_done", restored=True)
+        return StepWait(driver, MODEL_WAIT), True
+    return naver_login(driver), False
+
+def browser_cookies(driver: webdriver.Chrome) -> List[dict]:
+    """로그인된 드라이버의 전체 쿠키(도메인 무관, CDP 형식)"""
+    return driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+
+@resource_blocking.collects_on_failure
+def run_automation(
+    driver: webdriver.Chrome,
+    title: str = "1",
+    body: str = "2",
+    report: Optional[Callable[[str], None]] = None,
+    user_id: str = "default",
+    sessions=None,
+    engine: str = "browser",
+) -> dict:
+    """이미 떠 있는 드라이버로 로그인 → 글쓰기 페이지 → 작성/임시저장까지 수행
+
+    report가 주어지면 각 단계 시작 전에 단계 이름으로 호출됨(취소/진행 상황 확인용)
+    sessions(session_store.SessionStore)가 주어지면 저장된 세션을 먼저 복원해 로그인을 건너뜀
+    engine="direct"면 로그인 쿠키로 저장 요청을 직접 보내고, 실패할 때만 에디터에 입력
+    """
+    report = report or (lambda phase: None)
+    checkpoint = checkpoints.Checkpoint()
+    report("login")
+    wait, restored = checkpoints.run(
+        checkpoint, checkpoints.LOGGED_IN, lambda attempt: login_or_restore(driver, user_id, sessions),
+        before_retry=report,
+    )
+    used = "browser"
+    if engine == "direct":
+        report("direct_save")
+        if direct_save.save_post(user_id, browser_cookies(driver), title, body):
+            used = "direct"
+            checkpoint.mark(checkpoints.SAVED)
+    if used == "browser":
+        report("open_write_page")
+        open_editor(driver, wait, checkpoint, navigate=not restored, report=report)
+        if sessions is not None and not restored:
+            sessions.save(driver, user_id)
+        report("write_post")
+        write_post(driver, wait, title, body, checkpoint, report)
+    elif sessions is not None and not restored:
+        sessions.save(driver, user_id)
+    report("done")
+    return {
+        "title": title,
+        "body": body,
+        "saved": True,
+        "engine": used,
+        "session_reused": restored,
+        "checkpoints": checkpoint.to_dict(),
+        "wait_seconds": round(wait.total_wait(), 3),
+        "waits": wait.timings,
+        "blocking": resource_blocking.collect_stats(driver),
+    }
+
+@resource_blocking.collects_on_failure
+def run_batch(
+    driver: webdriver.Chrome,
+    posts: List[dict],
+    report: Optional[Callable[[str], None]] = None,
+    user_id: str = "default",
+    sessions=None,
+    engine: str = "browser",
+) -> dict:
+    """한 번 로그인한 드라이버로 여러 글({title, body})을 차례로 임시저장
+
+    글 하나가 실패해도 기록만 하고 다음 글을 계속 작성함
+    engine="direct"면 글마다 저장 요청을 직접 보내고, 실패한 글만 에디터로 작성
+    """
+    report = report or (lambda phase: None)
+    report("login")
+    login = checkpoints.Checkpoint()
+    wait, restored = checkpoints.run(
+        login, checkpoints.LOGGED_IN, lambda attempt: login_or_restore(driver, user_id, sessions),
+        before_retry=report,
+    )
+    on_write_page = restored
+    session_saved = restored or sessions is None
+    cookies = browser_cookies(driver) if engine == "direct" else None
+    if cookies and not session_saved:
+        sessions.save(driver, user_id)
+        session_saved = True
+
+    results = []
+    for index, post in enumerate(posts):
+        # report는 취소/시간 초과 시 예외를 던지므로 글별 예외 처리 밖에서 호출
+        report(f"post_{index}")
+        started = time.perf_counter()
+        progress.emit("post_start", f"📚 [{index + 1}/{len(posts)}] 번째 글 작성", index=index, total=len(posts))
+        # 글마다 로그인 이후부터 체크포인트를 새로 기록
+        checkpoint = checkpoints.Checkpoint([checkpoints.LOGGED_IN])
+        try:
+            if cookies and direct_save.save_post(user_id, cookies, post["title"], post["body"]):
+                checkpoint.mark(checkpoints.SAVED)
+                results.append({"index": index, "title": post["title"], "success": True, "engine": "direct"})
+                continue
+            open_editor(driver, wait, checkpoint, navigate=not on_write_page, report=report)
+            if not session_saved:
+                sessions.save(driver, user_id)
+                session_saved = True
+            write_post(driver, wait, post["title"], post["body"], checkpoint, report)
+            results.append({"index": index, "title": post["title"], "success": True, "engine": "browser"})
+        except Exception as e:
+            print(f"❌ {index + 1}번째 글 작성 실패: {e}")
+            results.append({"index": index, "title": post["title"], "success": False, "error": str(e)})
+        finally:
+            results[-1]["seconds"] = round(time.perf_counter() - started, 3)
+            results[-1]["checkpoints"] = checkpoint.to_dict()
+            progress.emit("post_done", **results[-1])
+            on_write_page = False  # 다음 글은 글쓰기 페이지를 새로 열어야 함
+            try:
+                driver.switch_to.default_content()
+            except WebDriverException:
+                pass
+
+    report("done")
+    succeeded = sum(1 for r in results if r["success"])
+    return {
+        "posts": results,
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "session_reused": restored,
+        "wait_seconds": round(wait.total_wait(), 3),
+        "blocking": resource_blocking.collect_stats(driver),
+    }
 
 def main():
     """메인 실행 함수"""
@@ -233,14 +470,8 @@ def main():
     driver = init_driver()
     
     try:
-        # 2. 네이버 로그인
-        wait = naver_login(driver)
-        
-        # 3. 블로그 글쓰기 페이지 열기
-        open_write_page(driver, wait)
-        
-        # 4. 포스트 작성 (제목: "1", 내용: "2")
-        write_post(driver, wait, "1", "2")
+        # 2~4. 네이버 로그인 → 블로그 글쓰기 페이지 → 포스트 작성 (제목: "1", 내용: "2")
+        run_automation(driver, "1", "2")
         
         print("🎉 블로그 포스트 작성이 완료되었습니다!")
         print("📄 제목: '1'")
@@ -264,7 +495,6 @@ def main():
                 print("\n🔚 프로그램을 종료합니다.")
         else:
             print("🤖 헤드리스 환경에서 작업 완료. 브라우저를 종료합니다.")
-            time.sleep(2)  # 결과 확인 시간
         
     except Exception as e:
         print(f"❌ 오류가 발생했습니다: {e}")
@@ -272,7 +502,7 @@ def main():
     finally:
         try:
             if os.environ.get('RENDER') or os.environ.get('DISPLAY'):
-                driver.quit()  # 헤드리스 환경에서는 명시적으로 종료
+                quit_driver(driver)  # 헤드리스 환경에서는 명시적으로 종료(프로필 복제본도 삭제)
         except:
             pass
 
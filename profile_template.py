@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+# profile_template.py
+# 미리 데워 둔 Chrome 프로필(--user-data-dir) 템플릿을 만들어 두고, 실행마다 복제본으로 Chrome을 띄움
+# → SmartEditor JS/CSS를 매번 새로 받고 컴파일하지 않도록 HTTP 캐시/코드 캐시를 재사용
+#
+# 디렉터리 구조 (CHROME_PROFILE_ROOT, 기본 .chrome_profiles/)
+#   template/         데워 둔 템플릿 (쿠키/로그인 정보는 지운 상태)
+#   clones/<pid>-<id> 실행 중인 Chrome이 쓰는 복제본 (종료 시 삭제, 남은 것은 gc에서 정리)
+
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import subprocess
+import threading
+from typing import Callable, Optional
+
+import chrome_resolver
+
+PROFILE_TEMPLATE = os.environ.get("PROFILE_TEMPLATE", "1") == "1"  # 템플릿 사용 여부
+PROFILE_ROOT = os.environ.get(
+    "CHROME_PROFILE_ROOT",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".chrome_profiles"),
+)
+PROFILE_TEMPLATE_MAX_AGE = float(os.environ.get("PROFILE_TEMPLATE_MAX_AGE_H", 24)) * 3600
+PROFILE_TEMPLATE_CHECK = float(os.environ.get("PROFILE_TEMPLATE_CHECK_MIN", 10)) * 60  # 실행 중 재확인 주기
+
+TEMPLATE_DIR = os.path.join(PROFILE_ROOT, "template")
+CLONES_DIR = os.path.join(PROFILE_ROOT, "clones")
+META_FILE = ".template_meta.json"
+
+# 템플릿에 남기면 안 되는 것: 로그인 흔적(다른 사용자에게 새지 않도록)과 실행 중 잠금 파일
+# Chrome 96부터 쿠키는 Default/Network/ 아래에 저장됨(이전 위치도 함께 지움)
+SCRUB_PATHS = [
+    "Default/Network/Cookies",
+    "Default/Network/Cookies-journal",
+    "Default/Network/TransportSecurity",
+    "Default/Network/Trust Tokens",
+    "Default/Network/Trust Tokens-journal",
+    "Default/Network/Network Persistent State",
+    "Default/Network/Reporting and NEL",
+    "Default/Network/Reporting and NEL-journal",
+    "Default/Cookies",
+    "Default/Cookies-journal",
+    "Default/Login Data",
+    "Default/Login Data-journal",
+    "Default/Login Data For Account",
+    "Default/Login Data For Account-journal",
+    "Default/Web Data",
+    "Default/Web Data-journal",
+    "Default/Local Storage",
+    "Default/Session Storage",
+    "Default/Sessions",
+    "Default/IndexedDB",
+    "Default/Current Session",
+    "Default/Current Tabs",
+    "Default/Last Session",
+    "Default/Last Tabs",
+    "SingletonLock",
+    "SingletonSocket",
+    "SingletonCookie",
+]
+
+# 정리 후 템플릿 어디에도 있으면 안 되는 파일 이름(위치가 바뀌어도 잡아내기 위한 최종 확인용)
+SECRET_FILES = {"Cookies", "Cookies-journal", "Login Data", "Login Data-journal",
+                "Login Data For Account", "Login Data For Account-journal"}
+
+_lock = threading.Lock()
+_active = set()  # 이 프로세스에서 사용 중인 복제본 경로
+_warm: Optional[Callable[[str], None]] = None  # ensure()에 넘긴 함수(실행 중 다시 만들 때 사용)
+_building = False   # 템플릿용 Chrome이 떠 있는 동안 True(입장 제어가 브라우저 수에 포함)
+_last_check = 0.0
+
+
+def _read_meta() -> Optional[dict]:
+    try:
+        with open(os.path.join(TEMPLATE_DIR, META_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def stale_reason(meta: Optional[dict] = None) -> Optional[str]:
+    """템플릿을 새로 만들어야 하는 이유, 쓸 수 있으면 None"""
+    meta = meta if meta is not None else _read_meta()
+    if not meta:
+        return "템플릿 없음"
+    if time.time() - meta.get("created_at", 0) > PROFILE_TEMPLATE_MAX_AGE:
+        return "템플릿이 오래됨"
+    version = chrome_resolver.resolve().get("chrome_version")
+    if version and meta.get("chrome_version") != version:
+        return f"Chrome 버전 변경 ({meta.get('chrome_version')} → {version})"
+    return None
+
+
+def _copy_tree(src: str, dst: str):
+    """copy-on-write 복사(cp --reflink=auto)를 먼저 시도하고, 안 되면 일반 복사
+
+    하드링크는 Chrome이 캐시 파일을 제자리에서 고쳐 쓰면 템플릿까지 바뀌므로 쓰지 않음
+    """
+    if shutil.which("cp"):
+        result = subprocess.run(["cp", "--reflink=auto", "-a", src, dst], capture_output=True)
+        if result.returncode == 0:
+            return
+        shutil.rmtree(dst, ignore_errors=True)
+    shutil.copytree(src, dst, symlinks=True)
+
+
+def scrub(path: str):
+    """종료된 프로필에서 쿠키/스토리지/세션/잠금 파일 삭제 (HTTP 캐시와 코드 캐시는 유지)"""
+    for rel in SCRUB_PATHS:
+        target = os.path.join(path, rel)
+        if os.path.isdir(target) and not os.path.islink(target):
+            shutil.rmtree(target, ignore_errors=True)
+        elif os.path.lexists(target):
+            try:
+                os.remove(target)
+            except OSError:
+                pass
+
+
+def leftover_secrets(path: str) -> list:
+    """정리된 프로필에 남아 있는 쿠키/로그인 저장 파일 경로(상대 경로) 목록"""
+    found = []
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            if name in SECRET_FILES:
+                found.append(os.path.relpath(os.path.join(dirpath, name), path))
+    return found
+
+
+def build(warm: Callable[[str], None]):
+    """새 템플릿 생성: warm(경로)가 그 경로로 Chrome을 띄워 페이지를 열고 종료하면, 정리 후 교체
+
+    만드는 동안에는 기존 템플릿을 계속 복제할 수 있도록 다른 디렉터리에서 만든 뒤 이름만 바꿈
+    이미 다른 스레드가 만드는 중이면 아무것도 하지 않음
+    """
+    global _building
+    with _lock:
+        if _building:
+            return
+        _building = True
+    try:
+        _build(warm)
+    finally:
+        with _lock:
+            _building = False
+
+
+def _build(warm: Callable[[str], None]):
+    os.makedirs(PROFILE_ROOT, exist_ok=True)
+    building = os.path.join(PROFILE_ROOT, f"template.building-{uuid.uuid4().hex[:8]}")
+    started = time.perf_counter()
+    try:
+        warm(building)
+        scrub(building)
+        # 로그인한 계정의 세션 쿠키가 복제본마다 퍼지지 않도록, 하나라도 남아 있으면 템플릿으로 쓰지 않음
+        leftovers = leftover_secrets(building)
+        if leftovers:
+            raise RuntimeError(f"프로필 정리 후에도 로그인 정보가 남아 있습니다: {', '.join(leftovers)}")
+        with open(os.path.join(building, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({
+                "created_at": time.time(),
+                "chrome_version": chrome_resolver.resolve().get("chrome_version"),
+            }, f)
+        with _lock:
+            old = None
+            if os.path.exists(TEMPLATE_DIR):
+                old = os.path.join(PROFILE_ROOT, f"template.old-{uuid.uuid4().hex[:8]}")
+                os.rename(TEMPLATE_DIR, old)
+            os.rename(building, TEMPLATE_DIR)
+        if old:
+            shutil.rmtree(old, ignore_errors=True)
+    finally:
+        shutil.rmtree(building, ignore_errors=True)
+    print(f"🧊 Chrome 프로필 템플릿 생성 완료 ({time.perf_counter() - started:.1f}초)")
+
+
+def building() -> bool:
+    return _building
+
+
+def ensure(warm: Callable[[str], None]) -> bool:
+    """남은 복제본을 정리하고, 템플릿이 없거나 오래됐으면 새로 만듦 → 템플릿 사용 가능 여부
+
+    warm은 기억해 두었다가 실행 중에 템플릿이 오래되면 refresh_if_stale()이 다시 사용
+    """
+    global _warm, _last_check
+    if not PROFILE_TEMPLATE:
+        return False
+    _warm = warm
+    _last_check = time.time()
+    gc()
+    reason = stale_reason()
+    if reason:
+        print(f"🧊 Chrome 프로필 템플릿을 새로 만듭니다: {reason}")
+        try:
+            build(warm)
+        except Exception as e:
+            print(f"❌ 프로필 템플릿 생성 실패: {e}")
+    return os.path.exists(TEMPLATE_DIR)
+
+
+def refresh_if_stale():
+    """PROFILE_TEMPLATE_CHECK마다 템플릿이 오래됐거나 Chrome 버전이 바뀌었는지 확인해 백그라운드에서 다시 만듦
+
+    시작 시 ensure()만으로는 오래 떠 있는 인스턴스의 템플릿이 갱신되지 않으므로 clone() 때마다 호출
+    """
+    global _last_check
+    if not PROFILE_TEMPLATE or _warm is None:
+        return
+    with _lock:
+        if _building or time.time() - _last_check < PROFILE_TEMPLATE_CHECK:
+            return
+        _last_check = time.time()
+    reason = stale_reason()
+    if not reason:
+        return
+    print(f"🧊 Chrome 프로필 템플릿을 백그라운드에서 다시 만듭니다: {reason}")
+
+    def _rebuild():
+        try:
+            build(_warm)
+        except Exception as e:
+            print(f"❌ 프로필 템플릿 갱신 실패: {e}")
+    threading.Thread(target=_rebuild, name="profile-template-refresh", daemon=True).start()
+
+
+def clone() -> Optional[str]:
+    """템플릿 복제본 경로(이 실행 전용), 템플릿이 없거나 꺼져 있으면 None"""
+    if not PROFILE_TEMPLATE:
+        return None
+    refresh_if_stale()
+    path = os.path.join(CLONES_DIR, f"{os.getpid()}-{uuid.uuid4().hex[:8]}")
+    with _lock:
+        if not os.path.exists(TEMPLATE_DIR):
+            return None
+        os.makedirs(CLONES_DIR, exist_ok=True)
+        try:
+            _copy_tree(TEMPLATE_DIR, path)
+        except OSError as e:
+            print(f"⚠️ 프로필 템플릿 복제 실패, 빈 프로필로 실행합니다: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        _active.add(path)
+    return path
+
+
+def release(path: Optional[str]):
+    """Chrome 종료 후 복제본 삭제"""
+    if not path:
+        return
+    with _lock:
+        _active.discard(path)
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def gc() -> int:
+    """주인 프로세스가 죽었거나 이 프로세스에서 더 이상 쓰지 않는 복제본과 중단된 빌드 삭제 → 삭제 수"""
+    removed = 0
+    try:
+        entries = os.listdir(CLONES_DIR)
+    except OSError:
+        entries = []
+    with _lock:
+        for name in entries:
+            path = os.path.join(CLONES_DIR, name)
+            pid = name.split("-", 1)[0]
+            if not pid.isdigit():
+                continue
+            mine = int(pid) == os.getpid()
+            if (mine and path not in _active) or (not mine and not _pid_alive(int(pid))):
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+    try:
+        leftovers = [n for n in os.listdir(PROFILE_ROOT) if n.startswith(("template.building-", "template.old-"))]
+    except OSError:
+        leftovers = []
+    for name in leftovers:
+        shutil.rmtree(os.path.join(PROFILE_ROOT, name), ignore_errors=True)
+    if removed:
+        print(f"🧹 남은 Chrome 프로필 복제본 {removed}개 삭제")
+    return removed
+
+
+def stats() -> dict:
+    meta = _read_meta()
+    return {
+        "enabled": PROFILE_TEMPLATE,
+        "building": _building,
+        "template_created_at": meta.get("created_at") if meta else None,
+        "chrome_version": meta.get("chrome_version") if meta else None,
+        "active_clones": len(_active),
+    }
+
+
+if __name__ == "__main__":
+    # 수동 갱신: python profile_template.py [--force]
+    from naver_manual_login import warm_profile
+
+    if "--force" in sys.argv[1:]:
+        gc()
+        build(warm_profile)
+    else:
+        ensure(warm_profile)
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+# progress.py
+# 자동화 단계별 진행 이벤트: 콘솔에 출력하고, 현재 스레드에 연결된 작업(job)이 있으면 그쪽으로도 전달
+
+import threading
+from contextlib import contextmanager
+from typing import Callable
+
+_local = threading.local()
+
+
+@contextmanager
+def bind(sink: Callable[..., None]):
+    """with progress.bind(job.add_event): 블록 안에서 emit된 이벤트를 sink로 전달"""
+    previous = getattr(_local, "sink", None)
+    _local.sink = sink
+    try:
+        yield
+    finally:
+        _local.sink = previous
+
+
+def emit(phase: str, message: str = "", **data):
+    """진행 이벤트 하나를 기록(기존 print 로그 대체). 이벤트 전달 실패는 자동화를 멈추지 않음"""
+    if message:
+        print(message)
+    sink = getattr(_local, "sink", None)
+    if sink is None:
+        return
+    try:
+        sink(phase, message, data)
+    except Exception as e:
+        print(f"⚠️ 진행 이벤트 전달 실패: {e}")
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+# resource_blocking.py
+# 헤드리스 실행 시 자동화에 필요 없는 리소스(이미지/폰트/미디어/광고·분석 스크립트)를 CDP로 차단
+#
+# 프로필 선택: BLOCK_PROFILE=automation (기본) | images | fonts | media | trackers | none
+# 여러 개는 쉼표로: BLOCK_PROFILE=images,trackers
+
+import os
+import json
+from fnmatch import fnmatchcase
+from functools import lru_cache, wraps
+from typing import Dict, List, Tuple
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+
+import metrics
+
+BLOCK_PROFILE = os.environ.get("BLOCK_PROFILE", "automation")
+BLOCK_STATS = os.environ.get("BLOCK_STATS", "1") == "1"  # 차단 건수 집계(performance 로그) 사용 여부
+
+PROFILES: Dict[str, List[str]] = {
+    "images": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.m3u8", "*.ts"],
+    "trackers": [
+        "*://*.doubleclick.net/*",
+        "*://*.google-analytics.com/*",
+        "*://*.googletagmanager.com/*",
+        "*://*.googlesyndication.com/*",
+        "*://wcs.naver.net/*",
+        "*://lcs.naver.com/*",
+        "*://nlog.naver.com/*",
+        "*://tivan.naver.com/*",
+        "*://veta.naver.com/*",
+        "*://siape.veta.naver.com/*",
+        "*://ssl.pstatic.net/tveta/*",
+    ],
+}
+PROFILES["automation"] = PROFILES["images"] + PROFILES["fonts"] + PROFILES["media"] + PROFILES["trackers"]
+PROFILES["none"] = []
+
+# 에디터 동작에 꼭 필요한 리소스: 어떤 차단 패턴에도 걸리면 안 됨
+EDITOR_ALLOWLIST = [
+    "https://editor-static.pstatic.net/*",
+    "https://ssl.pstatic.net/static.se2/*",
+    "https://blog.naver.com/*.js",
+    "https://nid.naver.com/*.js",
+]
+
+# 차단으로 아낀 바이트는 직접 잴 수 없으므로 리소스 종류별 평균 크기로 추정
+ESTIMATED_BYTES = {"Image": 40_000, "Font": 60_000, "Media": 500_000, "Script": 50_000, "Other": 10_000}
+
+
+def _split(glob: str) -> Tuple[str, str, str]:
+    """URL 패턴 → (scheme, host, path), '*.png'처럼 주소 부분이 없으면 scheme/host는 '*'"""
+    if "://" not in glob:
+        return "*", "*", glob.lstrip("/") or "*"
+    scheme, _, rest = glob.partition("://")
+    host, _, path = rest.partition("/")
+    return scheme, host, path or "*"
+
+
+def _overlaps(a: str, b: str) -> bool:
+    """URL 패턴 a와 b 둘 다에 걸리는 URL이 있을 수 있는지(scheme/host/path를 각각 비교)"""
+    return all(_glob_overlaps(x, y) for x, y in zip(_split(a), _split(b)))
+
+
+def _glob_overlaps(a: str, b: str) -> bool:
+    """와일드카드(*) 패턴 a와 b 둘 다에 걸리는 문자열이 있는지"""
+    @lru_cache(maxsize=None)
+    def match(i: int, j: int) -> bool:
+        if i == len(a) and j == len(b):
+            return True
+        if i < len(a) and a[i] == "*":
+            return match(i + 1, j) or (j < len(b) and match(i, j + 1))
+        if j < len(b) and b[j] == "*":
+            return match(i, j + 1) or (i < len(a) and match(i + 1, j))
+        return i < len(a) and j < len(b) and a[i] == b[j] and match(i + 1, j + 1)
+    return match(0, 0)
+
+
+def _profile_patterns(profile: str) -> List[str]:
+    patterns = []
+    for name in (p.strip() for p in profile.split(",")):
+        if name not in PROFILES:
+            raise ValueError(f"알 수 없는 차단 프로필: {name}")
+        patterns.extend(p for p in PROFILES[name] if p not in patterns)
+    return patterns
+
+
+def blocked_patterns(profile: str = BLOCK_PROFILE) -> List[str]:
+    """프로필 이름(쉼표 구분 가능) → 차단 URL 패턴 (Network.setBlockedURLs의 urls 형식)
+
+    urls 형식에는 '허용' 규칙이 없으므로, 허용 목록 URL에 걸릴 수 있는 차단 패턴(예: *.png는
+    editor-static.pstatic.net의 이미지에도 걸림)은 아예 뺌. 허용 규칙을 지원하는 Chrome에서는
+    apply()가 url_patterns()를 대신 사용
+    """
+    return [p for p in _profile_patterns(profile) if not any(_overlaps(p, allowed) for allowed in EDITOR_ALLOWLIST)]
+
+
+def _url_pattern(glob: str) -> str:
+    """'*.png', '*://host/*' 같은 패턴 → URLPattern 문자열('*://*:*/*.png', '*://host:*/*')"""
+    scheme, host, path = _split(glob)
+    if ":" not in host:
+        host += ":*"
+    return f"{scheme}://{host}/{path}"
+
+
+def url_patterns(profile: str = BLOCK_PROFILE) -> List[dict]:
+    """허용 목록을 먼저 두고 차단 패턴을 뒤에 둔 BlockPattern 목록(앞에서 먼저 걸린 규칙이 적용됨)"""
+    patterns = _profile_patterns(profile)
+    if not patterns:
+        return []
+    return ([{"urlPattern": _url_pattern(p), "block": False} for p in EDITOR_ALLOWLIST]
+            + [{"urlPattern": _url_pattern(p), "block": True} for p in patterns])
+
+
+def is_blocked(url: str, profile: str = BLOCK_PROFILE) -> bool:
+    """url_patterns() 규칙을 적용했을 때 url이 차단되는지(허용 규칙 우선)"""
+    for allowed in EDITOR_ALLOWLIST:
+        if fnmatchcase(url, allowed):
+            return False
+    return any(fnmatchcase(url, p) for p in _profile_patterns(profile))
+
+
+def enable_performance_log(opts: Options):
+    """차단된 요청 수를 세기 위해 CDP Network 이벤트를 performance 로그로 받음"""
+    if BLOCK_STATS:
+        opts.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+def apply(driver: webdriver.Chrome, profile: str = BLOCK_PROFILE) -> List[str]:
+    """드라이버에 차단 프로필 적용(페이지 이동 전에 한 번 호출) → 적용한 차단 패턴
+
+    허용 규칙(urlPatterns)을 지원하는 Chrome이면 허용 목록만 빼고 전부 차단하고,
+    지원하지 않으면 허용 목록과 겹치는 패턴을 뺀 urls 형식으로 대체
+    """
+    rules = url_patterns(profile)
+    if not rules:
+        return []
+    driver.execute_cdp_cmd("Network.enable", {})
+    try:
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urlPatterns": rules})
+        patterns = [r["urlPattern"] for r in rules if r["block"]]
+    except WebDriverException:
+        patterns = blocked_patterns(profile)
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    print(f"🚫 리소스 차단 프로필 '{profile}' 적용 ({len(patterns)}개 패턴)")
+    return patterns
+
+
+def collect_stats(driver: webdriver.Chrome) -> dict:
+    """지난 호출 이후 차단된 요청 수와 아낀 바이트(추정)를 리소스 종류별로 집계
+
+    performance 로그는 읽으면 비워지므로 실행 단위로 호출하면 그 실행의 수치가 됨
+    """
+    try:
+        entries = driver.get_log("performance") if BLOCK_STATS else []
+    except Exception:
+        entries = []
+
+    by_type: Dict[str, int] = {}
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        if message.get("method") != "Network.loadingFailed":
+            continue
+        params = message.get("params", {})
+        if params.get("blockedReason") != "inspector":
+            continue
+        kind = params.get("type", "Other")
+        by_type[kind] = by_type.get(kind, 0) + 1
+
+    for kind, count in by_type.items():
+        metrics.BLOCKED_REQUESTS.inc(count, type=kind)
+        metrics.BLOCKED_BYTES.inc(ESTIMATED_BYTES.get(kind, ESTIMATED_BYTES["Other"]) * count, type=kind)
+    return {
+        "blocked_requests": sum(by_type.values()),
+        "estimated_bytes_saved": sum(ESTIMATED_BYTES.get(k, ESTIMATED_BYTES["Other"]) * n for k, n in by_type.items()),
+        "by_type": by_type,
+    }
+
+
+def collects_on_failure(func):
+    """driver를 첫 인자로 받는 실행 함수용 데코레이터: 예외로 끝나도 collect_stats로 로그를 읽어 비움
+
+    성공 경로에서만 읽으면 실패한 실행의 차단 수가 다음 실행에 섞이고, 계속 실패하면 로그가 쌓이기만 함
+    """
+    @wraps(func)
+    def wrapper(driver, *args, **kwargs):
+        try:
+            return func(driver, *args, **kwargs)
+        except BaseException:
+            collect_stats(driver)
+            raise
+    return wrapper
+
+
+def discard_log(driver: webdriver.Chrome):
+    """집계하지 않고 performance 로그만 비움 (풀 반납 시: 실행 사이에 쌓인 항목이 다음 실행에 섞이지 않도록)"""
+    if not BLOCK_STATS:
+        return
+    try:
+        driver.get_log("performance")
+    except Exception:
+        pass
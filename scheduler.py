@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# scheduler.py
+# 작업 스케줄링: 사용자별 라운드로빈 대기열 + 메모리/브라우저 수 기반 입장 제어
+
+import os
+from collections import OrderedDict, deque
+from typing import Callable, Iterator, Optional
+
+JOB_QUEUE_MAX = int(os.environ.get("JOB_QUEUE_MAX", 50))            # 전체 대기열 한도
+USER_MAX_QUEUED = int(os.environ.get("USER_MAX_QUEUED", 10))        # 사용자별 대기 한도
+USER_MAX_CONCURRENT = int(os.environ.get("USER_MAX_CONCURRENT", 1))  # 사용자별 동시 실행 한도
+ADMISSION_MIN_FREE_MB = float(os.environ.get("ADMISSION_MIN_FREE_MB", 350))  # 새 Chrome 하나에 필요한 여유 메모리
+ADMISSION_MAX_BROWSERS = int(os.environ.get("ADMISSION_MAX_BROWSERS", 2))
+ADMISSION_POLL = float(os.environ.get("ADMISSION_POLL", 1.0))       # 입장 거부 시 재확인 간격(초)
+
+
+class QueueFull(Exception):
+    """대기열이 가득 차서 작업을 받을 수 없을 때(retry_after초 뒤 재시도 권장)"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class FairQueue:
+    """사용자별 대기열을 라운드로빈으로 꺼내는 큐(한 사용자가 다른 사용자를 굶기지 않도록)"""
+
+    def __init__(self):
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator:
+        for queue in self._queues.values():
+            yield from queue
+
+    def user_len(self, user_id: str) -> int:
+        return len(self._queues.get(user_id, ()))
+
+    def push(self, job):
+        self._queues.setdefault(job.user_id, deque()).append(job)
+        self._size += 1
+
+    def remove(self, job) -> bool:
+        queue = self._queues.get(job.user_id)
+        if not queue or job not in queue:
+            return False
+        queue.remove(job)
+        self._size -= 1
+        if not queue:
+            del self._queues[job.user_id]
+        return True
+
+    def pop_next(self, eligible: Callable[[str], bool]):
+        """실행 가능한(eligible) 사용자 중 가장 오래 차례를 기다린 사용자의 작업을 꺼냄"""
+        for user_id in list(self._queues):
+            if not eligible(user_id):
+                continue
+            queue = self._queues.pop(user_id)
+            job = queue.popleft()
+            self._size -= 1
+            if queue:
+                self._queues[user_id] = queue  # 맨 뒤로 보내 다음 차례는 다른 사용자에게
+            return job
+        return None
+
+    def clear(self):
+        self._queues.clear()
+        self._size = 0
+
+    def by_user(self) -> dict:
+        return {user_id: len(queue) for user_id, queue in self._queues.items()}
+
+
+# ---- 메모리 측정 ----
+def _read_int(path: str) -> Optional[int]:
+    try:
+        with open(path) as f:
+            value = f.read().strip()
+    except OSError:
+        return None
+    return int(value) if value.isdigit() else None
+
+
+def available_memory_mb() -> Optional[float]:
+    """MemAvailable과 컨테이너(cgroup) 한도 중 더 작은 여유 메모리(MB), 알 수 없으면 None"""
+    candidates = []
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    candidates.append(int(line.split()[1]) * 1024)
+                    break
+    except OSError:
+        pass
+    # cgroup v2 → v1 순서로 확인 (Render 인스턴스 메모리 한도)
+    for limit_path, usage_path in (
+        ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory.current"),
+        ("/sys/fs/cgroup/memory/memory.limit_in_bytes", "/sys/fs/cgroup/memory/memory.usage_in_bytes"),
+    ):
+        limit, usage = _read_int(limit_path), _read_int(usage_path)
+        if limit is not None and usage is not None and limit < 1 << 60:
+            candidates.append(limit - usage)
+            break
+    return min(candidates) / 1024 / 1024 if candidates else None
+
+
+class AdmissionController:
+    """새 작업을 지금 시작해도 되는지 판단: 여유 메모리와 살아있는 브라우저 수 기준
+
+    idle_browsers/live_browsers는 브라우저 풀 상태를 돌려주는 함수.
+    쉬고 있는 브라우저가 있으면 새 Chrome을 띄우지 않으므로 메모리 검사를 생략함
+    """
+
+    def __init__(
+        self,
+        idle_browsers: Callable[[], int],
+        live_browsers: Callable[[], int],
+        min_free_mb: float = ADMISSION_MIN_FREE_MB,
+        max_browsers: int = ADMISSION_MAX_BROWSERS,
+    ):
+        self.idle_browsers = idle_browsers
+        self.live_browsers = live_browsers
+        self.min_free_mb = min_free_mb
+        self.max_browsers = max_browsers
+        self.last_reason: Optional[str] = None
+
+    def __call__(self, running: int) -> bool:
+        # 실행 중인 작업이 하나도 없으면 항상 입장(메모리가 부족해도 대기열이 멈추지 않도록)
+        if running == 0:
+            self.last_reason = None
+            return True
+        if self.idle_browsers() > 0:
+            self.last_reason = None
+            return True
+        if self.live_browsers() >= self.max_browsers:
+            self.last_reason = f"브라우저 수 한도({self.max_browsers}) 도달"
+            return False
+        free = available_memory_mb()
+        if free is not None and free < self.min_free_mb:
+            self.last_reason = f"여유 메모리 부족 ({free:.0f}MB < {self.min_free_mb:.0f}MB)"
+            return False
+        self.last_reason = None
+        return True
+
+    def stats(self) -> dict:
+        free = available_memory_mb()
+        return {
+            "available_memory_mb": round(free, 1) if free is not None else None,
+            "min_free_mb": self.min_free_mb,
+            "live_browsers": self.live_browsers(),
+            "max_browsers": self.max_browsers,
+            "blocked_reason": self.last_reason,
+        }
@@ -1,11 +1,35 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-import subprocess
+from fastapi.responses import PlainTextResponse, StreamingResponse
 import os
+import json
+import time
 import asyncio
-from pydantic import BaseModel
+import threading
+from typing import List, Optional, Tuple
+from pydantic import BaseModel, Field
+
+# Render 환경에서 헤드리스 Chrome으로 실행 (가상 디스플레이)
+os.environ.setdefault('DISPLAY', ':99')
+
+import chrome_resolver
+import direct_save
+import metrics
+import profile_template
+import progress
+from browser_pool import BrowserPool
+from jobs import JOB_TIMEOUT, IdempotencyConflict, Job, JobManager
+from scheduler import AdmissionController, QueueFull
+from naver_manual_login import NAV_ID, NAV_PW, ensure_profile_template, run_automation, run_batch
+from session_store import SessionStore
+from waits import latency
 
 app = FastAPI(title="Naver Blog Automation API")
+browser_pool = BrowserPool()
+session_store = SessionStore()
+
+BATCH_MAX_POSTS = int(os.environ.get("BATCH_MAX_POSTS", 50))
+BATCH_POST_TIMEOUT = float(os.environ.get("BATCH_POST_TIMEOUT", 60))  # 배치 작업은 글 수만큼 시간 추가
 
 # CORS 설정
 app.add_middleware(
@@ -16,9 +40,128 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+ENGINE_DESCRIPTION = (
+    "browser: Selenium으로 에디터에 입력 후 저장. "
+    "direct(실험적): 브라우저 없이 저장 요청만 보냄. 기본 요청/응답 형식은 로컬 벤치(fake_naver)용 "
+    "stand-in이라 실제 네이버 저장 API와 다를 수 있음(NAVER_DRAFT_SAVE_URL, DIRECT_SAVE_FORMAT 참고). "
+    "실패하면 browser로 대체"
+)
+
 class AutomationRequest(BaseModel):
     user_id: str = "default"
     action: str = "start_naver"
+    title: str = "1"
+    body: str = "2"
+    # 같은 키로 다시 보내면 새로 실행하지 않고 기존 작업/결과를 돌려줌 (Idempotency-Key 헤더로도 가능)
+    idempotency_key: Optional[str] = None
+    # "direct": 저장된 로그인 쿠키로 저장 요청만 보냄(실패 시 브라우저로 대체)
+    engine: str = Field("browser", description=ENGINE_DESCRIPTION)
+
+class Post(BaseModel):
+    title: str
+    body: str
+
+class BatchRequest(BaseModel):
+    user_id: str = "default"
+    posts: List[Post]
+    idempotency_key: Optional[str] = None
+    engine: str = Field("browser", description=ENGINE_DESCRIPTION)
+
+def _save_without_browser(job: Job, posts: List[dict]) -> List[dict]:
+    """저장된 세션 쿠키로 앞에서부터 브라우저 없이 저장, 처음 실패한 글에서 멈춤 → 성공한 글 결과"""
+    entry = session_store.get(job.user_id)
+    done = []
+    if entry is None or not direct_save.default_saver.enabled:
+        return done
+    for index, post in enumerate(posts):
+        job.report(f"direct_{index}")
+        started = time.perf_counter()
+        if not direct_save.save_post(job.user_id, entry.cookies, post["title"], post["body"]):
+            break
+        done.append({"index": index, "title": post["title"], "success": True, "engine": "direct",
+                     "seconds": round(time.perf_counter() - started, 3)})
+        progress.emit("post_done", **done[-1])
+    return done
+
+def _run_job(job: Job) -> dict:
+    """워커 스레드에서 실행: 풀에서 브라우저를 빌려 자동화 수행
+
+    engine="direct"면 브라우저를 빌리기 전에 저장된 세션 쿠키로 먼저 저장해 보고,
+    남은 글만 브라우저 경로(그 안에서도 새 로그인 쿠키로 direct 재시도)로 넘김
+    """
+    print(f"Starting automation for user: {job.user_id} (job {job.id})")
+    engine = job.params.get("engine", "browser")
+    batch = "posts" in job.params
+    posts = job.params["posts"] if batch else [{"title": job.params["title"], "body": job.params["body"]}]
+    with progress.bind(job.add_event):
+        done = _save_without_browser(job, posts) if engine == "direct" else []
+        if done and not batch:
+            return {"title": posts[0]["title"], "body": posts[0]["body"], "saved": True,
+                    "engine": "direct", "session_reused": True, "browser": False}
+        if batch and len(done) == len(posts):
+            return {"posts": done, "succeeded": len(done), "failed": 0, "session_reused": True, "browser": False}
+
+        job.report("lease_browser")
+        lease_started = time.perf_counter()
+        with browser_pool.lease() as driver, job.abort_hook(lambda: browser_pool.kill(driver)):
+            metrics.BROWSER_LEASE_SECONDS.observe(time.perf_counter() - lease_started)
+            progress.emit("driver_init", "🚗 브라우저 준비 완료", pool=browser_pool.stats())
+            if not batch:
+                return run_automation(
+                    driver, job.params["title"], job.params["body"],
+                    report=job.report, user_id=job.user_id, sessions=session_store, engine=engine
+                )
+            result = run_batch(
+                driver, posts[len(done):], report=job.report, user_id=job.user_id,
+                sessions=session_store, engine=engine
+            )
+    # 브라우저 없이 먼저 저장한 글과 합치기(번호는 원래 순서 기준)
+    for r in result["posts"]:
+        r["index"] += len(done)
+    result["posts"] = done + result["posts"]
+    result["succeeded"] += len(done)
+    return result
+
+admission = AdmissionController(
+    idle_browsers=lambda: browser_pool.stats()["idle"],
+    # 템플릿을 만드는 동안 풀 밖에서 Chrome이 하나 더 떠 있으므로 함께 셈
+    live_browsers=lambda: browser_pool.stats()["total"] + (1 if profile_template.building() else 0),
+)
+job_manager = JobManager(_run_job, admission=admission)
+
+def _submit(user_id: str, params: dict, idempotency_key: Optional[str] = None,
+            timeout: float = JOB_TIMEOUT) -> Tuple[Job, bool]:
+    """중복 요청은 기존 작업으로 합치고, 대기열이 가득 차면 429 + Retry-After로 바로 거절"""
+    try:
+        return job_manager.submit_once(user_id, params, idempotency_key, timeout=timeout)
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except QueueFull as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+@app.on_event("startup")
+async def warm_up_browser_pool():
+    # 예열은 수 초가 걸리므로 백그라운드에서 진행하고 서버는 바로 요청을 받음
+    def _warm():
+        try:
+            chrome_resolver.resolve()
+            ensure_profile_template()  # 풀의 브라우저가 데워 둔 프로필 복제본으로 뜨도록 먼저 준비
+            browser_pool.warm_up()
+        except Exception as e:
+            print(f"❌ 브라우저 풀 예열 실패: {e}")
+        browser_pool.start_maintenance()  # 폐기된 드라이버 보충, 오래된 대기 드라이버 교체
+    threading.Thread(target=_warm, name="browser-pool-warmup", daemon=True).start()
+    job_manager.start()
+
+@app.on_event("shutdown")
+async def close_browser_pool():
+    job_manager.shutdown()
+    direct_save.default_saver.close()
+    await asyncio.to_thread(browser_pool.close)
 
 @app.get("/")
 async def root():
@@ -35,51 +178,124 @@ async def health_check():
         "message": "Render 서버 정상 운영 중"
     }
 
-@app.post("/api/run-naver")
-async def run_naver_automation(request: AutomationRequest):
-    try:
-        print(f"Starting automation for user: {request.user_id}")
-        
-        # Render 환경에서 헤드리스 Chrome으로 실행
-        env = os.environ.copy()
-        env['DISPLAY'] = ':99'  # 가상 디스플레이
-        
-        # Python 스크립트 실행
-        result = subprocess.run([
-            "python", "naver_manual_login.py"
-        ], 
-        capture_output=True, 
-        text=True, 
-        timeout=300,  # 5분 타임아웃
-        env=env
+def _require_credentials():
+    if not NAV_ID or not NAV_PW:
+        raise HTTPException(
+            status_code=503,
+            detail="환경변수 NAVER_ID 또는 NAVER_PW가 설정되지 않았습니다."
         )
-        
-        if result.returncode == 0:
-            return {
-                "success": True,
-                "message": "네이버 자동화가 시작되었습니다.",
-                "output": result.stdout,
-                "user_id": request.user_id
-            }
-        else:
-            return {
-                "success": False,
-                "message": "Python 스크립트 실행 중 오류 발생",
-                "error": result.stderr,
-                "user_id": request.user_id
-            }
-            
-    except subprocess.TimeoutExpired:
-        return {
-            "success": False,
-            "message": "실행 시간 초과 (5분)",
-            "user_id": request.user_id
-        }
-    except Exception as e:
+
+def _require_engine(engine: str):
+    if engine not in direct_save.ENGINES:
+        raise HTTPException(status_code=400, detail=f"engine은 {', '.join(direct_save.ENGINES)} 중 하나여야 합니다.")
+
+@app.post("/api/run-naver", status_code=202)
+async def run_naver_automation(request: AutomationRequest, idempotency_key: Optional[str] = Header(None)):
+    _require_credentials()
+    _require_engine(request.engine)
+    
+    # 실행은 워커 풀에 맡기고 job id만 바로 반환
+    job, deduplicated = _submit(
+        request.user_id,
+        {"action": request.action, "title": request.title, "body": request.body, "engine": request.engine},
+        request.idempotency_key or idempotency_key
+    )
+    return {
+        "success": True,
+        "message": "이미 등록된 같은 작업을 반환합니다." if deduplicated else "네이버 자동화 작업이 등록되었습니다.",
+        "job_id": job.id,
+        "status": job.status,
+        "user_id": request.user_id,
+        "deduplicated": deduplicated,
+        "result": job.result
+    }
+
+@app.post("/api/run-naver/batch", status_code=202)
+async def run_naver_batch(request: BatchRequest, idempotency_key: Optional[str] = Header(None)):
+    """여러 글을 한 번의 로그인/브라우저 세션에서 임시저장"""
+    _require_credentials()
+    _require_engine(request.engine)
+    if not request.posts:
+        raise HTTPException(status_code=400, detail="posts가 비어 있습니다.")
+    if len(request.posts) > BATCH_MAX_POSTS:
         raise HTTPException(
-            status_code=500, 
-            detail=f"서버 오류: {str(e)}"
+            status_code=400,
+            detail=f"한 번에 최대 {BATCH_MAX_POSTS}개까지 작성할 수 있습니다."
         )
+    
+    job, deduplicated = _submit(
+        request.user_id,
+        {"posts": [post.model_dump() for post in request.posts], "engine": request.engine},
+        request.idempotency_key or idempotency_key,
+        timeout=JOB_TIMEOUT + BATCH_POST_TIMEOUT * len(request.posts)
+    )
+    return {
+        "success": True,
+        "message": "이미 등록된 같은 작업을 반환합니다." if deduplicated
+                   else f"네이버 자동화 배치 작업({len(request.posts)}개)이 등록되었습니다.",
+        "job_id": job.id,
+        "status": job.status,
+        "user_id": request.user_id,
+        "deduplicated": deduplicated,
+        "result": job.result
+    }
+
+def _get_job_or_404(job_id: str) -> Job:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    return job
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    return _get_job_or_404(job_id).to_dict()
+
+SSE_KEEPALIVE = 15  # 초
+
+def _sse(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request, last_event_id: Optional[str] = Header(None)):
+    """작업 진행 이벤트를 Server-Sent Events로 실시간 전송 (Last-Event-ID로 이어받기 가능)"""
+    job = _get_job_or_404(job_id)
+    seq = int(last_event_id) if last_event_id and last_event_id.isdigit() else 0
+
+    async def event_stream():
+        nonlocal seq
+        notify = job.subscribe()
+        try:
+            while True:
+                notify.clear()
+                events, dropped = job.events_after(seq)
+                if dropped:
+                    yield _sse("dropped", {"count": dropped})
+                for event in events:
+                    seq = event["seq"]
+                    yield _sse("progress", event, event_id=seq)
+                if job.finished:
+                    yield _sse("end", job.to_dict())
+                    return
+                if await request.is_disconnected():
+                    return
+                try:
+                    await asyncio.wait_for(notify.wait(), timeout=SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+        finally:
+            job.unsubscribe(notify)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.delete("/api/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    _get_job_or_404(job_id)
+    return job_manager.cancel(job_id).to_dict()
 
 @app.get("/api/status")
 async def get_status():
@@ -91,13 +307,27 @@ async def get_status():
             "15분 비활성 시 슬립 모드",
             "첫 요청 시 30초 콜드스타트",
             "월 750시간 제한"
-        ]
+        ],
+        "browser_pool": browser_pool.stats(),
+        "jobs": job_manager.stats(),
+        "admission": admission.stats(),
+        "sessions": session_store.stats(),
+        "direct_save": {"enabled": direct_save.default_saver.enabled, "format": direct_save.default_saver.format,
+                        "experimental": True},
+        "profile_template": profile_template.stats(),
+        "wait_latency": latency.summary()
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus 텍스트 형식 지표 (단계별 지연 시간, 작업 결과, Chrome 프로세스/메모리)"""
+    # /proc 순회가 있으므로 이벤트 루프 밖에서 수집
+    body = await asyncio.to_thread(metrics.render)
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.get("/api/debug")
 async def debug_info():
     """시스템 디버그 정보"""
-    import subprocess
     import glob
     
     debug_data = {
@@ -107,41 +337,14 @@ async def debug_info():
     }
     
     # Chrome 바이너리 경로 확인
-    chrome_paths = [
-        '/usr/bin/google-chrome-stable',
-        '/usr/bin/google-chrome',
-        '/usr/bin/chromium-browser',
-        '/opt/google/chrome/chrome'
-    ]
-    
-    for path in chrome_paths:
+    for path in chrome_resolver.CHROME_PATHS:
         if os.path.exists(path):
             debug_data["chrome_paths"].append({"path": path, "exists": True})
         else:
             debug_data["chrome_paths"].append({"path": path, "exists": False})
     
-    # 시스템 명령어 실행
-    try:
-        # which google-chrome
-        result = subprocess.run(['which', 'google-chrome'], capture_output=True, text=True)
-        debug_data["system_info"]["which_chrome"] = {
-            "returncode": result.returncode,
-            "stdout": result.stdout.strip(),
-            "stderr": result.stderr.strip()
-        }
-    except Exception as e:
-        debug_data["system_info"]["which_chrome"] = {"error": str(e)}
-    
-    try:
-        # google-chrome --version
-        result = subprocess.run(['google-chrome', '--version'], capture_output=True, text=True)
-        debug_data["system_info"]["chrome_version"] = {
-            "returncode": result.returncode,
-            "stdout": result.stdout.strip(),
-            "stderr": result.stderr.strip()
-        }
-    except Exception as e:
-        debug_data["system_info"]["chrome_version"] = {"error": str(e)}
+    # Chrome/드라이버 정보는 매번 which/--version을 실행하지 않고 캐시된 매니페스트에서 읽음
+    debug_data["system_info"]["chrome_manifest"] = chrome_resolver.cached()
     
     try:
         # ls /usr/bin/*chrome*
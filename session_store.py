@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+# session_store.py
+# 사용자(user_id)별 로그인 세션 캐시: 쿠키/localStorage를 저장해 두었다가 새 드라이버에 복원
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from naver_manual_login import BLOG_WRITE_URL
+
+SESSION_TTL = float(os.environ.get("SESSION_TTL_MIN", 60)) * 60
+SESSION_MAX_ENTRIES = int(os.environ.get("SESSION_MAX_ENTRIES", 100))
+SESSION_CHECK_TIMEOUT = float(os.environ.get("SESSION_CHECK_TIMEOUT", 5))
+
+# CDP Network.setCookies가 받는 필드만 남김
+COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+
+class SessionEntry:
+    """로그인 직후 저장한 쿠키와 origin별 localStorage"""
+
+    def __init__(self, cookies: List[dict], local_storage: Dict[str, dict]):
+        self.cookies = cookies
+        self.local_storage = local_storage
+        self.saved_at = time.time()
+
+    def expired(self, ttl: float) -> bool:
+        return time.time() - self.saved_at > ttl
+
+
+def _is_login_page(url: str) -> bool:
+    return "nidlogin" in url or "nid.naver.com" in url
+
+
+class SessionStore:
+    """TTL 만료와 LRU 방식 개수 제한을 갖는 메모리 세션 저장소"""
+
+    def __init__(self, ttl: float = SESSION_TTL, max_entries: int = SESSION_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, SessionEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ---- 저장소 관리 ----
+    def get(self, user_id: str) -> Optional[SessionEntry]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry.expired(self.ttl):
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry
+
+    def put(self, user_id: str, entry: SessionEntry):
+        with self._lock:
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries, "ttl_sec": self.ttl}
+
+    # ---- 드라이버 연동 ----
+    def save(self, driver: webdriver.Chrome, user_id: str):
+        """로그인된 드라이버에서 전체 쿠키와 현재 origin의 localStorage를 저장"""
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+        origin, items = driver.execute_script(
+            "var o = {};"
+            "for (var i = 0; i < localStorage.length; i++) {"
+            "  var k = localStorage.key(i); o[k] = localStorage.getItem(k);"
+            "}"
+            "return [location.origin, o];"
+        )
+        self.put(user_id, SessionEntry(cookies, {origin: items}))
+        print(f"💾 {user_id} 세션을 저장했습니다. (쿠키 {len(cookies)}개)")
+
+    def restore(self, driver: webdriver.Chrome, user_id: str) -> bool:
+        """저장된 세션을 드라이버에 복원하고 BLOG_WRITE_URL이 로그인 없이 열리는지 확인
+
+        성공하면 드라이버는 글쓰기 페이지에 머물러 있고, 실패하면 항목을 지우고 False 반환
+        """
+        entry = self.get(user_id)
+        if entry is None:
+            return False
+
+        cookies = [
+            {k: c[k] for k in COOKIE_FIELDS if k in c and not (k == "expires" and c[k] < 0)}
+            for c in entry.cookies
+        ]
+        try:
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+            driver.get(BLOG_WRITE_URL)
+            # 로그인 페이지로 리다이렉트되거나 에디터 프레임이 뜰 때까지 짧게 대기
+            WebDriverWait(driver, SESSION_CHECK_TIMEOUT).until(
+                lambda d: _is_login_page(d.current_url)
+                or d.find_elements(By.CSS_SELECTOR, "iframe#mainFrame")
+            )
+            valid = not _is_login_page(driver.current_url)
+        except (TimeoutException, WebDriverException):
+            valid = False
+
+        if not valid:
+            print(f"🔑 {user_id} 저장된 세션이 만료되었습니다. 다시 로그인합니다.")
+            self.invalidate(user_id)
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            return False
+
+        items = entry.local_storage.get(driver.execute_script("return location.origin;"))
+        if items:
+            driver.execute_script(
+                "for (var k in arguments[0]) localStorage.setItem(k, arguments[0][k]);", items
+            )
+        print(f"♻️ {user_id} 저장된 세션으로 로그인을 건너뜁니다.")
+        return True
@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+# tests/conftest.py
+# 저장소 루트의 모듈(jobs, scheduler, ...)을 바로 import할 수 있도록 경로 추가
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
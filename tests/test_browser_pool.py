@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# tests/test_browser_pool.py
+# 풀 재활용: 폐기된 드라이버를 min_size까지 백그라운드에서 보충하고, 반납 시 저장소까지 초기화
+
+import time
+
+import pytest
+
+import browser_pool
+from browser_pool import BrowserPool
+
+
+class _Driver:
+    created = 0
+
+    def __init__(self):
+        _Driver.created += 1
+        self.current_url = "https://blog.naver.com/GoBlogWrite.naver"
+        self.cdp = []
+        self.quit_called = False
+
+        class _SwitchTo:
+            def default_content(self):
+                pass
+        self.switch_to = _SwitchTo()
+
+    def execute_cdp_cmd(self, cmd, args):
+        self.cdp.append((cmd, args))
+
+    def get(self, url):
+        self.current_url = url
+
+    def get_log(self, kind):
+        return []
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture(autouse=True)
+def fake_quit(monkeypatch):
+    monkeypatch.setattr(browser_pool, "quit_driver", lambda driver: driver.quit())
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_recycled_driver_is_replaced_up_to_min_size():
+    pool = BrowserPool(factory=_Driver, min_size=1, max_size=2, max_jobs=2)
+    pool.warm_up()
+    for _ in range(2):
+        with pool.lease() as driver:
+            pass
+
+    _wait_for(lambda: pool.stats()["idle"] == 1)
+    assert driver.quit_called
+    assert pool.stats()["total"] == 1
+    with pool.lease() as fresh:
+        assert fresh is not driver
+    pool.close()
+
+
+def test_reset_clears_web_storage():
+    pool = BrowserPool(factory=_Driver, min_size=0, max_size=1)
+    with pool.lease() as driver:
+        pass
+
+    cleared = {args["origin"] for cmd, args in driver.cdp if cmd == "Storage.clearDataForOrigin"}
+    assert "https://blog.naver.com" in cleared
+    assert ("Network.clearBrowserCookies", {}) in driver.cdp
+    pool.close()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# tests/test_checkpoints.py
+# 단계별 재시도: 시도 횟수, 대기 시간(backoff), 통과한 단계 건너뛰기, 재시도하지 않는 예외
+
+import pytest
+from selenium.common.exceptions import InvalidSessionIdException, TimeoutException
+
+import checkpoints
+from checkpoints import Checkpoint, RetryPolicy
+from text_input import InsertionError
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(checkpoints.time, "sleep", slept.append)
+    return slept
+
+
+def _flaky(failures, error=TimeoutException):
+    """처음 failures번은 error를 던지고 그다음엔 시도 번호를 돌려주는 action"""
+    attempts = []
+
+    def action(attempt):
+        attempts.append(attempt)
+        if len(attempts) <= failures:
+            raise error("flaky")
+        return attempt
+    action.attempts = attempts
+    return action
+
+
+def test_retries_until_success_and_marks_phase(sleeps):
+    checkpoint = Checkpoint()
+    action = _flaky(2)
+    recovered = []
+
+    result = checkpoints.run(checkpoint, checkpoints.SAVED, action, recover=lambda: recovered.append(1),
+                             policy=RetryPolicy(3, 1.0))
+
+    assert result == 2
+    assert action.attempts == [0, 1, 2]
+    assert len(recovered) == 2
+    assert checkpoint.passed(checkpoints.SAVED)
+    assert checkpoint.retries[checkpoints.SAVED] == 2
+
+
+def test_backoff_grows_by_factor(sleeps, monkeypatch):
+    monkeypatch.setattr(checkpoints, "RETRY_BACKOFF_FACTOR", 2)
+    monkeypatch.setattr(checkpoints, "RETRY_MAX_BACKOFF", 3)
+
+    checkpoints.run(Checkpoint(), checkpoints.SAVED, _flaky(3), policy=RetryPolicy(4, 1.0))
+
+    assert sleeps == [1.0, 2.0, 3.0]
+
+
+def test_raises_after_last_attempt(sleeps):
+    checkpoint = Checkpoint()
+    action = _flaky(5)
+
+    with pytest.raises(TimeoutException):
+        checkpoints.run(checkpoint, checkpoints.EDITOR_OPEN, action, policy=RetryPolicy(2, 0.5))
+
+    assert action.attempts == [0, 1]
+    assert not checkpoint.passed(checkpoints.EDITOR_OPEN)
+
+
+def test_passed_phase_is_skipped(sleeps):
+    checkpoint = Checkpoint([checkpoints.LOGGED_IN])
+    action = _flaky(0)
+
+    assert checkpoints.run(checkpoint, checkpoints.LOGGED_IN, action) is None
+    assert action.attempts == []
+
+
+@pytest.mark.parametrize("error", [InsertionError, InvalidSessionIdException])
+def test_non_retryable_errors_are_not_retried(sleeps, error):
+    action = _flaky(1, error)
+
+    with pytest.raises(error):
+        checkpoints.run(Checkpoint(), checkpoints.BODY_WRITTEN, action, policy=RetryPolicy(3, 0.5))
+
+    assert action.attempts == [0]
+    assert sleeps == []
+
+
+def test_before_retry_can_abort(sleeps):
+    def before_retry(phase):
+        raise RuntimeError(phase)
+
+    with pytest.raises(RuntimeError, match="retry_saved"):
+        checkpoints.run(Checkpoint(), checkpoints.SAVED, _flaky(1), before_retry=before_retry,
+                        policy=RetryPolicy(3, 0.5))
+
+
+def test_phase_retry_override(monkeypatch):
+    monkeypatch.setattr(checkpoints, "POLICIES", dict(checkpoints.POLICIES))
+    checkpoints._load_overrides("editor_open=4:1.5, saved=2")
+
+    assert checkpoints.POLICIES[checkpoints.EDITOR_OPEN].attempts == 4
+    assert checkpoints.POLICIES[checkpoints.EDITOR_OPEN].backoff == 1.5
+    assert checkpoints.POLICIES[checkpoints.SAVED].attempts == 2
+    with pytest.raises(ValueError):
+        checkpoints._load_overrides("unknown=1")
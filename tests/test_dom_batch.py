@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# tests/test_dom_batch.py
+# 도움말 패널 닫기: 패널이 하나씩 늦게 떠도(팝업이 닫힌 뒤, 앞 패널을 닫은 뒤) 모두 닫는지
+# 저장 버튼 클릭: 네이티브 클릭을 쓰고 가려졌을 때만 JS 클릭으로 대체하는지
+
+import threading
+
+from selenium.common.exceptions import ElementClickInterceptedException
+
+import dom_batch
+from waits import LatencyTracker, StepWait
+
+
+class _SequentialPanels:
+    """fake_naver --sequential-help처럼 delay초 뒤에 패널이 하나씩 뜨는 가짜 드라이버"""
+
+    def __init__(self, panels: int, delay: float = 0.15):
+        self.hidden = panels
+        self.visible = 0
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._show_later()
+
+    def _show_later(self):
+        def show():
+            with self._lock:
+                if self.hidden:
+                    self.hidden -= 1
+                    self.visible += 1
+        timer = threading.Timer(self.delay, show)
+        timer.daemon = True
+        timer.start()
+
+    def execute_script(self, script, *args):
+        with self._lock:
+            if script == dom_batch.CLICK_ALL_JS:
+                clicked, self.visible = ["button"] * self.visible, 0
+                if clicked:
+                    self._show_later()
+                return clicked
+            if script == dom_batch.FIRST_VISIBLE_JS:
+                return ["close", "button"] if self.visible else None
+        return True  # waits.elements_closed: 클릭한 패널은 바로 사라짐
+
+
+def test_close_all_waits_for_late_panels():
+    driver = _SequentialPanels(panels=3)
+    wait = StepWait(driver, tracker=LatencyTracker())
+
+    result = dom_batch.close_all(driver, wait, ".se-help-panel-close-button", "help_panel_close", appear_grace=1.0)
+
+    assert result["closed"] == 3
+    assert driver.visible == 0 and driver.hidden == 0
+
+
+def test_close_all_without_panels_stops_after_grace():
+    driver = _SequentialPanels(panels=0)
+    wait = StepWait(driver, tracker=LatencyTracker())
+
+    result = dom_batch.close_all(driver, wait, ".se-help-panel-close-button", "help_panel_close", appear_grace=0.2)
+
+    assert result["closed"] == 0
+    assert result["passes"] == 1
+
+
+class _Button:
+    def __init__(self, intercepted: bool):
+        self.intercepted = intercepted
+        self.native_clicks = 0
+
+    def click(self):
+        if self.intercepted:
+            raise ElementClickInterceptedException("covered")
+        self.native_clicks += 1
+
+
+class _ClickDriver:
+    def __init__(self):
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+
+
+def test_scroll_and_click_uses_native_click():
+    driver, button = _ClickDriver(), _Button(intercepted=False)
+
+    result = dom_batch.scroll_and_click(driver, button, "save_button")
+
+    assert button.native_clicks == 1
+    assert driver.scripts == [dom_batch.SCROLL_CENTER_JS]
+    assert result == {"intercepted": False, "round_trips_saved": 1}
+
+
+def test_scroll_and_click_falls_back_to_js_when_intercepted():
+    driver, button = _ClickDriver(), _Button(intercepted=True)
+
+    result = dom_batch.scroll_and_click(driver, button, "save_button")
+
+    assert result["intercepted"]
+    assert driver.scripts == [dom_batch.SCROLL_CENTER_JS, dom_batch.JS_CLICK_JS]
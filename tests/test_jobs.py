@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# tests/test_jobs.py
+# 중복 요청 합치기(single-flight)와 멱등성 키: 결과 재사용, 내용 충돌, 보관 시간 만료
+# 워커를 띄우지 않고 작업 종료는 _finish로 직접 처리
+
+import time
+
+import pytest
+
+import jobs
+from jobs import FAILED, SUCCEEDED, IdempotencyConflict, JobManager
+
+
+@pytest.fixture
+def manager():
+    return JobManager(runner=lambda job: {})
+
+
+def test_same_request_joins_inflight_job(manager):
+    job, dedup = manager.submit_once("u", {"title": "a"})
+    again, dedup_again = manager.submit_once("u", {"title": "a"})
+
+    assert not dedup and dedup_again
+    assert again is job
+
+
+def test_different_request_is_new_job(manager):
+    job, _ = manager.submit_once("u", {"title": "a"})
+    other, dedup = manager.submit_once("u", {"title": "b"})
+    other_user, dedup_user = manager.submit_once("v", {"title": "a"})
+
+    assert not dedup and other is not job
+    assert not dedup_user and other_user is not job
+
+
+def test_idempotency_key_returns_succeeded_result(manager):
+    job, _ = manager.submit_once("u", {"title": "a"}, idempotency_key="k")
+    manager._finish(job, SUCCEEDED, result={"saved": True})
+
+    again, dedup = manager.submit_once("u", {"title": "a"}, idempotency_key="k")
+    assert dedup and again is job
+    assert again.result == {"saved": True}
+
+
+def test_idempotency_key_with_different_params_conflicts(manager):
+    manager.submit_once("u", {"title": "a"}, idempotency_key="k")
+    with pytest.raises(IdempotencyConflict):
+        manager.submit_once("u", {"title": "b"}, idempotency_key="k")
+
+
+def test_idempotency_key_is_scoped_per_user(manager):
+    job, _ = manager.submit_once("u", {"title": "a"}, idempotency_key="k")
+    other, dedup = manager.submit_once("v", {"title": "b"}, idempotency_key="k")
+
+    assert not dedup and other is not job
+
+
+def test_failed_job_runs_again(manager):
+    job, _ = manager.submit_once("u", {"title": "a"}, idempotency_key="k")
+    manager._finish(job, FAILED, error="boom")
+
+    again, dedup = manager.submit_once("u", {"title": "a"}, idempotency_key="k")
+    assert not dedup and again is not job
+
+
+def test_idempotency_key_expires_after_ttl(manager, monkeypatch):
+    monkeypatch.setattr(jobs, "IDEMPOTENCY_TTL", 60)
+    job, _ = manager.submit_once("u", {"title": "a"}, idempotency_key="k")
+    manager._finish(job, SUCCEEDED, result={})
+
+    again, dedup = manager.submit_once("u", {"title": "a"}, idempotency_key="k")
+    assert dedup and again is job
+
+    job.finished_at = time.time() - 61
+    fresh, dedup = manager.submit_once("u", {"title": "a"}, idempotency_key="k")
+    assert not dedup and fresh is not job
+    assert manager.stats()["idempotency_keys"] == 1
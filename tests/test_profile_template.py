@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# tests/test_profile_template.py
+# 프로필 템플릿: 로그인 쿠키가 남지 않는지, 실행 중에 오래된 템플릿을 백그라운드에서 다시 만드는지
+
+import os
+import time
+
+import pytest
+
+import chrome_resolver
+import profile_template
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    monkeypatch.setattr(profile_template, "PROFILE_ROOT", str(tmp_path))
+    monkeypatch.setattr(profile_template, "TEMPLATE_DIR", str(tmp_path / "template"))
+    monkeypatch.setattr(profile_template, "CLONES_DIR", str(tmp_path / "clones"))
+    monkeypatch.setattr(profile_template, "PROFILE_TEMPLATE", True)
+    monkeypatch.setattr(profile_template, "_warm", None)
+    monkeypatch.setattr(chrome_resolver, "resolve", lambda: {"chrome_version": "1"})
+    return tmp_path
+
+
+def _warm(path):
+    os.makedirs(os.path.join(path, "Default", "Network"))
+    for rel in ("Default/Network/Cookies", "Default/Login Data", "Default/Cache"):
+        with open(os.path.join(path, rel), "w") as f:
+            f.write("x")
+
+
+def test_template_has_no_login_data(root):
+    assert profile_template.ensure(_warm)
+    assert profile_template.leftover_secrets(profile_template.TEMPLATE_DIR) == []
+    assert os.path.exists(os.path.join(profile_template.TEMPLATE_DIR, "Default", "Cache"))
+
+
+def test_stale_template_is_rebuilt_in_background(root, monkeypatch):
+    profile_template.ensure(_warm)
+    monkeypatch.setattr(profile_template, "PROFILE_TEMPLATE_CHECK", 0)
+    monkeypatch.setattr(chrome_resolver, "resolve", lambda: {"chrome_version": "2"})
+
+    path = profile_template.clone()
+    assert path is not None  # 다시 만드는 동안에도 기존 템플릿으로 복제
+    deadline = time.monotonic() + 5
+    while profile_template.stale_reason() and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    assert profile_template.stale_reason() is None
+    profile_template.release(path)
+
+
+def test_recent_check_is_not_repeated(root, monkeypatch):
+    profile_template.ensure(_warm)
+    monkeypatch.setattr(chrome_resolver, "resolve", lambda: {"chrome_version": "2"})
+
+    profile_template.refresh_if_stale()
+    assert not profile_template.building()
+    assert profile_template.stale_reason() is not None
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# tests/test_resource_blocking.py
+# 에디터 허용 목록: 허용 URL은 차단 프로필에 걸려도 차단되지 않는지
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+import resource_blocking
+from resource_blocking import blocked_patterns, is_blocked, url_patterns
+
+
+@pytest.mark.parametrize("url", [
+    "https://editor-static.pstatic.net/c/resources/common/img/common-icon.png",
+    "https://editor-static.pstatic.net/c/resources/font/NanumGothic.woff2",
+    "https://ssl.pstatic.net/static.se2/static/full/icon.svg",
+    "https://blog.naver.com/static/editor.js",
+])
+def test_allowlisted_url_is_not_blocked(url):
+    assert not is_blocked(url, "automation")
+
+
+@pytest.mark.parametrize("url", [
+    "https://blogpfthumb-phinf.pstatic.net/profile.png",
+    "https://ssl.pstatic.net/tveta/libs/ad.js",
+    "https://www.google-analytics.com/analytics.js",
+])
+def test_other_urls_are_blocked(url):
+    assert is_blocked(url, "automation")
+
+
+def test_legacy_list_drops_patterns_overlapping_allowlist():
+    patterns = blocked_patterns("automation")
+    assert "*.png" not in patterns and "*.woff" not in patterns
+    assert "*://*.doubleclick.net/*" in patterns
+    assert "*://ssl.pstatic.net/tveta/*" in patterns
+
+
+def test_url_patterns_put_allow_rules_first():
+    rules = url_patterns("images")
+    allowed = [r for r in rules if not r["block"]]
+    assert rules[:len(allowed)] == allowed
+    assert {"urlPattern": "*://*:*/*.png", "block": True} in rules
+    assert url_patterns("none") == []
+
+
+class _Driver:
+    def __init__(self, supports_rules: bool):
+        self.supports_rules = supports_rules
+        self.blocked = None
+
+    def execute_cdp_cmd(self, cmd, args):
+        if cmd == "Network.setBlockedURLs":
+            if "urlPatterns" in args and not self.supports_rules:
+                raise WebDriverException("Invalid parameters")
+            self.blocked = args
+
+
+@pytest.mark.parametrize("supports_rules", [True, False])
+def test_apply_never_blocks_allowlist(supports_rules):
+    driver = _Driver(supports_rules)
+    resource_blocking.apply(driver, "automation")
+
+    if supports_rules:
+        assert driver.blocked["urlPatterns"] == url_patterns("automation")
+    else:
+        assert driver.blocked == {"urls": blocked_patterns("automation")}
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# tests/test_scheduler.py
+# 사용자별 라운드로빈 순서와, 메모리/브라우저 수에 따른 입장 제어 판단
+
+import pytest
+
+import scheduler
+from scheduler import AdmissionController, FairQueue
+
+
+class _Job:
+    def __init__(self, user_id, name):
+        self.user_id = user_id
+        self.name = name
+
+
+def _drain(queue, eligible=lambda user_id: True):
+    order = []
+    while True:
+        job = queue.pop_next(eligible)
+        if job is None:
+            return order
+        order.append(job.name)
+
+
+def test_fair_queue_round_robin_between_users():
+    queue = FairQueue()
+    for name in ("a1", "a2", "a3"):
+        queue.push(_Job("a", name))
+    queue.push(_Job("b", "b1"))
+    queue.push(_Job("c", "c1"))
+    queue.push(_Job("b", "b2"))
+
+    assert _drain(queue) == ["a1", "b1", "c1", "a2", "b2", "a3"]
+    assert len(queue) == 0
+
+
+def test_fair_queue_skips_ineligible_user():
+    queue = FairQueue()
+    queue.push(_Job("a", "a1"))
+    queue.push(_Job("b", "b1"))
+
+    assert queue.pop_next(lambda user_id: user_id != "a").name == "b1"
+    assert queue.pop_next(lambda user_id: user_id != "a") is None
+    assert queue.by_user() == {"a": 1}
+
+
+def test_fair_queue_remove():
+    queue = FairQueue()
+    first, second = _Job("a", "a1"), _Job("a", "a2")
+    queue.push(first)
+    queue.push(second)
+
+    assert queue.remove(first)
+    assert not queue.remove(first)
+    assert queue.user_len("a") == 1
+    assert _drain(queue) == ["a2"]
+
+
+@pytest.fixture
+def free_memory(monkeypatch):
+    state = {"mb": 4096.0}
+    monkeypatch.setattr(scheduler, "available_memory_mb", lambda: state["mb"])
+    return state
+
+
+def _controller(idle=0, live=0):
+    return AdmissionController(lambda: idle, lambda: live, min_free_mb=350, max_browsers=2)
+
+
+def test_admission_always_admits_when_nothing_runs(free_memory):
+    free_memory["mb"] = 10
+    assert _controller(live=5)(running=0)
+
+
+def test_admission_admits_idle_browser_without_memory_check(free_memory):
+    free_memory["mb"] = 10
+    assert _controller(idle=1, live=2)(running=1)
+
+
+def test_admission_rejects_at_browser_limit(free_memory):
+    admission = _controller(live=2)
+    assert not admission(running=1)
+    assert "브라우저 수 한도" in admission.last_reason
+
+
+def test_admission_rejects_low_memory(free_memory):
+    free_memory["mb"] = 200
+    admission = _controller(live=1)
+    assert not admission(running=1)
+    assert "여유 메모리 부족" in admission.last_reason
+
+    free_memory["mb"] = 1000
+    assert admission(running=1)
+    assert admission.last_reason is None
+
+
+def test_admission_admits_when_memory_unknown(free_memory):
+    free_memory["mb"] = None
+    assert _controller(live=1)(running=1)
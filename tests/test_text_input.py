@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# tests/test_text_input.py
+# 문단 묶음: 실제 줄바꿈 자리에서만 줄을 나누고, 긴 문단이 잘린 자리에는 줄바꿈을 넣지 않는지
+# 재시도 확인: 이전 시도가 이미 입력했으면 다시 입력하지 않는지
+
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+
+import checkpoints
+import naver_manual_login
+from text_input import InsertionError, TextInsertionEngine, _paragraph_batches
+
+
+def _rejoin(batches):
+    return "".join(piece + ("\n" if ends else "") for batch in batches for piece, ends in batch)
+
+
+@pytest.mark.parametrize("text", [
+    "x\n" + "b" * 1999 + "\ny",
+    "a" * 2500,
+    "a\n\nb\n",
+    "\n".join(["가나다라마바사" * 11] * 60),
+    "",
+])
+def test_batches_round_trip(text):
+    assert _rejoin(_paragraph_batches(text, size=2000)) == text
+
+
+def test_batch_boundary_on_line_break_keeps_break():
+    batches = _paragraph_batches("x\n" + "b" * 1999 + "\ny", size=2000)
+    assert len(batches) == 2
+    assert batches[0][-1] == ("b" * 1999, True)
+
+
+def test_long_line_cut_has_no_break():
+    batches = _paragraph_batches("a" * 2500, size=2000)
+    assert batches == [[("a" * 2000, False)], [("a" * 500, False)]]
+
+
+class _Editor:
+    """READ_TEXT_JS 대신 text를 돌려주고, stale_reads번은 다시 읽기에서 StaleElement를 던지는 가짜 드라이버"""
+
+    def __init__(self, text="", stale_reads=0):
+        self.text = text
+        self.stale_reads = stale_reads
+        self.inserts = 0
+
+    def execute_script(self, script, *args):
+        if self.inserts and self.stale_reads:
+            self.stale_reads -= 1
+            raise StaleElementReferenceException("re-rendered")
+        return self.text
+
+
+@pytest.fixture
+def engine():
+    return TextInsertionEngine(["keys"])
+
+
+def test_already_inserted(engine):
+    assert not engine.already_inserted(_Editor(""), None, "제목", before="")
+    assert engine.already_inserted(_Editor("제목"), None, "제목", before="")
+    assert engine.already_inserted(_Editor("제목"), None, "제목", before=None)
+    with pytest.raises(InsertionError):
+        engine.already_inserted(_Editor("제"), None, "제목", before="")
+
+
+def test_retry_after_stale_readback_does_not_insert_twice(engine, monkeypatch):
+    monkeypatch.setattr(checkpoints.time, "sleep", lambda s: None)
+    driver = _Editor(stale_reads=1)
+
+    def fake_insert(d, text):
+        d.inserts += 1
+        d.text += text
+    monkeypatch.setattr(engine.strategies[0], "insert", fake_insert)
+
+    monkeypatch.setattr(naver_manual_login, "text_engine", engine)
+    before = {}
+
+    def write_title(attempt):
+        # naver_manual_login._write_title에서 클릭(ActionChains)만 뺀 흐름
+        if naver_manual_login._resumed(driver, None, "제목", "title", attempt, before):
+            return "resumed"
+        return engine.insert(driver, None, "제목")
+
+    result = checkpoints.run(checkpoints.Checkpoint(), checkpoints.TITLE_WRITTEN, write_title)
+    assert result == "resumed"
+    assert driver.inserts == 1 and driver.text == "제목"
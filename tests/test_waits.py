@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# tests/test_waits.py
+# 적응형 타임아웃: 빠른 관측값 뒤 환경이 느려져도 시간 초과로 타임아웃이 다시 늘어나는지
+
+import pytest
+
+import waits
+from waits import LatencyTracker
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    monkeypatch.setattr(waits, "WAIT_MIN", 3)
+    monkeypatch.setattr(waits, "WAIT_MIN_LOAD", 10)
+    monkeypatch.setattr(waits, "WAIT_MAX", 30)
+    monkeypatch.setattr(waits, "WAIT_FACTOR", 3)
+    monkeypatch.setattr(waits, "WAIT_BACKOFF", 2)
+    monkeypatch.setattr(waits, "WAIT_MIN_SAMPLES", 5)
+    return LatencyTracker()
+
+
+def test_default_until_enough_samples(tracker):
+    for _ in range(4):
+        tracker.record("help_panel_close", 0.2)
+    assert tracker.timeout_for("help_panel_close", default=15) == 15
+
+
+def test_fast_history_clamps_to_floor(tracker):
+    for _ in range(50):
+        tracker.record("help_panel_close", 0.2)
+        tracker.record("main_frame", 0.2)
+    assert tracker.timeout_for("help_panel_close") == 3
+    # 페이지/프레임 로드는 더 높은 하한을 유지
+    assert tracker.timeout_for("main_frame") == 10
+
+
+def test_timeouts_grow_the_timeout_until_max(tracker):
+    for _ in range(50):
+        tracker.record("help_panel_close", 0.2)
+
+    tracker.record_timeout("help_panel_close", 3)
+    assert tracker.timeout_for("help_panel_close") == 6
+    tracker.record_timeout("help_panel_close", 6)
+    assert tracker.timeout_for("help_panel_close") == 12
+    for _ in range(3):
+        tracker.record_timeout("help_panel_close", tracker.timeout_for("help_panel_close"))
+    assert tracker.timeout_for("help_panel_close") == 30
+
+
+def test_recovers_after_timeouts_and_shrinks_again(tracker):
+    for _ in range(50):
+        tracker.record("help_panel_close", 0.2)
+    tracker.record_timeout("help_panel_close", 3)
+    tracker.record_timeout("help_panel_close", 6)
+
+    # 느려진 환경에서 성공: 방금 걸린 시간 × FACTOR 아래로는 줄지 않음
+    tracker.record("help_panel_close", 5)
+    assert tracker.timeout_for("help_panel_close") == 15
+
+    # 다시 빨라지면 boost가 절반씩 줄다가 관측값 기반 타임아웃으로 돌아감
+    for _ in range(5):
+        tracker.record("help_panel_close", 0.2)
+    assert tracker.timeout_for("help_panel_close") == 3
+
+
+def test_timeout_without_history_raises_default(tracker):
+    tracker.record_timeout("resume_popup", 15)
+    assert tracker.timeout_for("resume_popup", default=15) == 30
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+# text_input.py
+# 대량 텍스트 입력 엔진: 글자마다 ActionChains 프레임을 보내지 않고 문단 단위로 한 번에 입력
+
+import os
+import re
+from typing import List, Optional, Tuple
+
+from selenium import webdriver
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.remote.webelement import WebElement
+
+# 한 번의 명령으로 보낼 최대 글자 수(너무 큰 CDP/JS 메시지 방지)
+INSERT_CHUNK_CHARS = int(os.environ.get("INSERT_CHUNK_CHARS", 2000))
+# 시도 순서. 예: TEXT_INSERT_STRATEGIES=exec_command,keys
+DEFAULT_STRATEGIES = os.environ.get("TEXT_INSERT_STRATEGIES", "cdp,paste,exec_command,keys").split(",")
+
+_WHITESPACE = re.compile(r"[\s\u200b\ufeff]+")
+
+READ_TEXT_JS = """
+var el = arguments[0];
+if (el.tagName === 'INPUT' || el.tagName === 'TEXTAREA') return el.value;
+return el.innerText;
+"""
+
+
+class InsertionError(Exception):
+    """모든 입력 방식이 실패했거나 일부만 입력되어 되돌릴 수 없을 때"""
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE.sub(" ", text or "").strip()
+
+
+def _chunks(line: str, size: int = INSERT_CHUNK_CHARS) -> List[str]:
+    return [line[i:i + size] for i in range(0, len(line), size)] or [""]
+
+
+def _paragraph_batches(text: str, size: int = INSERT_CHUNK_CHARS) -> List[List[Tuple[str, bool]]]:
+    """(조각, 이 조각 뒤가 실제 줄바꿈인지) 목록을 글자 수 합계가 size를 넘지 않도록 묶음
+
+    긴 문단은 잘라서 넣되, 잘린 자리에는 줄바꿈을 넣지 않도록 줄 끝 여부를 조각마다 기록
+    """
+    lines = text.split("\n")
+    batches, current, length = [], [], 0
+    for i, line in enumerate(lines):
+        pieces = _chunks(line, size)
+        for j, piece in enumerate(pieces):
+            if current and length + len(piece) > size:
+                batches.append(current)
+                current, length = [], 0
+            current.append((piece, j == len(pieces) - 1 and i < len(lines) - 1))
+            length += len(piece)
+    batches.append(current)
+    return batches
+
+
+# ---- 입력 방식 ----
+class InsertStrategy:
+    """현재 포커스된 요소에 텍스트를 넣는 방식 하나"""
+    name = ""
+
+    def available(self, driver: webdriver.Chrome) -> bool:
+        return True
+
+    def insert(self, driver: webdriver.Chrome, text: str):
+        raise NotImplementedError
+
+
+class CdpInsertText(InsertStrategy):
+    """CDP Input.insertText: 문단마다 insertText 한 번 + Enter 키 이벤트"""
+    name = "cdp"
+
+    def available(self, driver):
+        return hasattr(driver, "execute_cdp_cmd")
+
+    def _enter(self, driver):
+        key = {"key": "Enter", "code": "Enter", "windowsVirtualKeyCode": 13}
+        driver.execute_cdp_cmd("Input.dispatchKeyEvent", dict(key, type="keyDown", text="\r"))
+        driver.execute_cdp_cmd("Input.dispatchKeyEvent", dict(key, type="keyUp"))
+
+    def insert(self, driver, text):
+        lines = text.split("\n")
+        for i, line in enumerate(lines):
+            for piece in _chunks(line):
+                if piece:
+                    driver.execute_cdp_cmd("Input.insertText", {"text": piece})
+            if i < len(lines) - 1:
+                self._enter(driver)
+
+
+class PasteEventInsert(InsertStrategy):
+    """페이지 안에서 만든 paste 이벤트로 붙여넣기(OS 클립보드/pyperclip을 쓰지 않아 작업 간 간섭 없음)"""
+    name = "paste"
+
+    JS = """
+    var dt = new DataTransfer();
+    dt.setData('text/plain', arguments[0]);
+    var ev = new ClipboardEvent('paste', {clipboardData: dt, bubbles: true, cancelable: true});
+    (document.activeElement || document.body).dispatchEvent(ev);
+    """
+
+    def insert(self, driver, text):
+        for batch in _paragraph_batches(text):
+            driver.execute_script(self.JS, "".join(piece + ("\n" if ends else "") for piece, ends in batch))
+
+
+class ExecCommandInsert(InsertStrategy):
+    """contenteditable 에디터용 execCommand('insertText'/'insertParagraph') 일괄 입력"""
+    name = "exec_command"
+
+    JS = """
+    var pieces = arguments[0];
+    for (var i = 0; i < pieces.length; i++) {
+      if (pieces[i][0]) document.execCommand('insertText', false, pieces[i][0]);
+      if (pieces[i][1]) document.execCommand('insertParagraph');
+    }
+    """
+
+    def insert(self, driver, text):
+        for batch in _paragraph_batches(text):
+            driver.execute_script(self.JS, [list(piece) for piece in batch])
+
+
+class KeyByKeyInsert(InsertStrategy):
+    """기존 방식: ActionChains로 한 글자씩 입력(가장 느리지만 마지막 대안)"""
+    name = "keys"
+
+    def insert(self, driver, text):
+        actions = ActionChains(driver)
+        lines = text.split("\n")
+        for i, line in enumerate(lines):
+            for ch in line:
+                actions.send_keys(ch).pause(0.0001)
+            if i < len(lines) - 1:
+                actions.send_keys(Keys.ENTER).pause(0.0001)
+        actions.perform()
+
+
+STRATEGIES = {s.name: s for s in (CdpInsertText(), PasteEventInsert(), ExecCommandInsert(), KeyByKeyInsert())}
+
+
+class TextInsertionEngine:
+    """방식을 순서대로 시도하고, 다시 읽어서 검증한 뒤 실패하면 다음 방식으로 넘어감"""
+
+    def __init__(self, strategies: Optional[List[str]] = None):
+        names = [n.strip() for n in (strategies or DEFAULT_STRATEGIES) if n.strip()]
+        unknown = [n for n in names if n not in STRATEGIES]
+        if unknown:
+            raise ValueError(f"알 수 없는 입력 방식: {unknown}")
+        self.strategies = [STRATEGIES[n] for n in names]
+        self.preferred: Optional[str] = None  # 마지막으로 성공한 방식을 먼저 시도
+
+    def _ordered(self, driver) -> List[InsertStrategy]:
+        ordered = sorted(self.strategies, key=lambda s: s.name != self.preferred)
+        return [s for s in ordered if s.available(driver)]
+
+    def read(self, driver: webdriver.Chrome, target: WebElement) -> str:
+        return _normalize(driver.execute_script(READ_TEXT_JS, target))
+
+    def already_inserted(self, driver: webdriver.Chrome, target: WebElement, text: str,
+                         before: Optional[str]) -> bool:
+        """재시도 전 확인: 이전 시도가 text를 이미 다 넣었으면 True (다시 넣으면 중복)
+
+        before는 첫 시도 전에 read()로 읽어 둔 내용(못 읽었으면 None).
+        내용이 바뀌었는데 text가 다 들어 있지 않으면 일부만 들어간 것이므로 InsertionError
+        """
+        current = self.read(driver, target)
+        expected = _normalize(text)
+        if before is None:
+            return bool(expected) and expected in current
+        if current == before:
+            return False
+        if expected in current:
+            return True
+        raise InsertionError("이전 시도에서 일부만 입력되어 다시 입력하면 내용이 중복됩니다.")
+
+    def insert(self, driver: webdriver.Chrome, target: WebElement, text: str) -> str:
+        """포커스가 이미 잡힌 상태에서 text를 입력하고 사용한 방식 이름을 반환
+
+        target은 입력 결과를 다시 읽어 검증할 요소(입력창 또는 에디터 영역)
+        """
+        before = self.read(driver, target)
+        expected = _normalize(text)
+        errors = []
+        for strategy in self._ordered(driver):
+            error = "입력 결과 확인 실패"
+            try:
+                strategy.insert(driver, text)
+            except Exception as e:
+                error = str(e)
+            after = self.read(driver, target)
+            if not expected or (expected in after and after != before):
+                self.preferred = strategy.name
+                return strategy.name
+            if after != before:
+                # 일부만 들어간 상태에서 다른 방식으로 다시 넣으면 중복되므로 중단
+                raise InsertionError(f"{strategy.name} 방식으로 일부만 입력되었습니다.")
+            errors.append(f"{strategy.name}: {error}")
+        raise InsertionError("모든 입력 방식 실패 - " + "; ".join(errors))
+
+
+default_engine = TextInsertionEngine()
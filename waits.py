@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+# waits.py
+# 고정 time.sleep 대신 단계별 조건을 기다리는 대기 레이어: 실제 대기 시간을 기록하고 타임아웃을 관측값에 맞춤
+
+import os
+import time
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+import metrics
+
+WAIT_DEFAULT = float(os.environ.get("WAIT_DEFAULT", 15))     # 관측값이 없을 때(기존 MODEL_WAIT)
+WAIT_MIN = float(os.environ.get("WAIT_MIN", 3))
+WAIT_MIN_LOAD = float(os.environ.get("WAIT_MIN_LOAD", 10))  # 페이지/프레임 로드 단계의 최소 타임아웃
+WAIT_MAX = float(os.environ.get("WAIT_MAX", 30))
+WAIT_POLL = float(os.environ.get("WAIT_POLL", 0.05))
+WAIT_FACTOR = float(os.environ.get("WAIT_FACTOR", 3))       # 타임아웃 = p95 × FACTOR
+WAIT_MIN_SAMPLES = int(os.environ.get("WAIT_MIN_SAMPLES", 5))
+WAIT_HISTORY = int(os.environ.get("WAIT_HISTORY", 200))
+WAIT_BACKOFF = float(os.environ.get("WAIT_BACKOFF", 2))      # 시간 초과 시 그 단계 타임아웃을 늘리는 배수
+
+# 네트워크/서버 상태에 따라 느려질 수 있는 단계(빠른 관측값만 보고 WAIT_MIN까지 줄이지 않음)
+LOAD_STEPS = {"login_form", "login_redirect", "main_frame", "resume_popup", "editor_elements", "save_toast"}
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class LatencyTracker:
+    """단계별로 최근 대기 시간을 모아 적응형 타임아웃을 계산
+
+    시간 초과는 실제 대기 시간을 알 수 없으므로 타임아웃 값을 표본(하한)으로 넣고, 그 단계의 타임아웃을
+    WAIT_BACKOFF배로 늘림(boost). 빠른 관측값만 쌓인 뒤 환경이 느려져도 타임아웃이 다시 커질 수 있도록
+    boost는 이후 성공할 때마다 줄어들되, 방금 성공한 대기 시간 × WAIT_FACTOR 아래로는 내려가지 않음
+    """
+
+    def __init__(self, history: int = WAIT_HISTORY):
+        self.history = history
+        self._samples: Dict[str, deque] = {}
+        self._boost: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, step: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(step, deque(maxlen=self.history)).append(seconds)
+            boost = self._boost.get(step)
+            if boost is not None:
+                boost = max(boost / WAIT_BACKOFF, seconds * WAIT_FACTOR)
+                if boost <= self._floor(step):
+                    del self._boost[step]
+                else:
+                    self._boost[step] = min(WAIT_MAX, boost)
+
+    def record_timeout(self, step: str, timeout: float):
+        with self._lock:
+            self._samples.setdefault(step, deque(maxlen=self.history)).append(timeout)
+            self._boost[step] = min(WAIT_MAX, max(self._boost.get(step, 0.0), timeout * WAIT_BACKOFF))
+
+    @staticmethod
+    def _floor(step: str) -> float:
+        return WAIT_MIN_LOAD if step in LOAD_STEPS else WAIT_MIN
+
+    def timeout_for(self, step: str, default: float = WAIT_DEFAULT) -> float:
+        with self._lock:
+            samples = list(self._samples.get(step, ()))
+            boost = self._boost.get(step, 0.0)
+        if len(samples) < WAIT_MIN_SAMPLES:
+            return max(default, boost)
+        adaptive = max(self._floor(step), percentile(samples, 95) * WAIT_FACTOR)
+        return min(WAIT_MAX, max(adaptive, boost))
+
+    def summary(self) -> dict:
+        with self._lock:
+            snapshot = {step: list(s) for step, s in self._samples.items()}
+        return {
+            step: {
+                "count": len(s),
+                "p50": round(percentile(s, 50), 3),
+                "p95": round(percentile(s, 95), 3),
+                "timeout": round(self.timeout_for(step), 3),
+            }
+            for step, s in snapshot.items()
+        }
+
+
+latency = LatencyTracker()
+
+
+class StepWait(WebDriverWait):
+    """WebDriverWait에 단계 이름을 붙여 적응형 타임아웃을 쓰고 실제 대기 시간을 기록"""
+
+    def __init__(self, driver, timeout: float = WAIT_DEFAULT, tracker: LatencyTracker = latency):
+        super().__init__(driver, timeout, poll_frequency=WAIT_POLL)
+        self.default_timeout = float(timeout)
+        self.tracker = tracker
+        self.timings: List[dict] = []  # 이번 실행의 단계별 대기 기록
+
+    def until(self, method: Callable, message: str = "", step: Optional[str] = None,
+              timeout: Optional[float] = None, adaptive: bool = True):
+        """timeout은 관측값이 부족할 때 쓸 이 단계의 기본값(없으면 생성 시 timeout)
+
+        adaptive=False면 timeout을 그대로 쓰고 관측값도 남기지 않음(시간 초과가 정상인 짧은 확인용)
+        """
+        step = step or getattr(method, "__name__", "wait")
+        if adaptive:
+            self._timeout = self.tracker.timeout_for(step, timeout or self.default_timeout)
+        else:
+            self._timeout = timeout or self.default_timeout
+        start = time.perf_counter()
+        ok = False
+        try:
+            result = super().until(method, message)
+            ok = True
+            return result
+        except TimeoutException:
+            metrics.WAIT_TIMEOUTS.inc(step=step)
+            if adaptive:
+                self.tracker.record_timeout(step, self._timeout)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            if ok and adaptive:
+                self.tracker.record(step, elapsed)
+            self.timings.append({
+                "step": step,
+                "seconds": round(elapsed, 3),
+                "timeout": round(self._timeout, 3),
+                "ok": ok,
+            })
+
+    def total_wait(self) -> float:
+        return sum(t["seconds"] for t in self.timings)
+
+
+# ---- 단계별 조건 ----
+def login_redirect_complete():
+    """로그인 버튼 클릭 후 로그인 페이지를 벗어났는지"""
+    return lambda d: "nidlogin.login" not in d.current_url
+
+
+def main_frame_ready():
+    return EC.frame_to_be_available_and_switch_to_it((By.CSS_SELECTOR, "iframe#mainFrame"))
+
+
+def elements_closed(elements: list):
+    """클릭한 닫기 버튼들이 모두 DOM에서 빠지거나 숨겨졌는지(여러 개를 한 번의 스크립트로 확인)"""
+    return lambda d: d.execute_script(
+        "return arguments[0].every(function (el) {"
+        " return !el.isConnected || el.getClientRects().length === 0; });",
+        elements,
+    )
+
+
+def save_toast():
+    return EC.presence_of_element_located(
+        (By.CSS_SELECTOR, ".toast_item__success, .se-toast-item__success")
+    )
+
+
+def wait_quietly(wait: StepWait, condition: Callable, step: str, timeout: Optional[float] = None,
+                 adaptive: bool = True) -> bool:
+    """조건을 기다리되 시간 초과면 False 반환(없어도 진행 가능한 단계용)"""
+    try:
+        wait.until(condition, step=step, timeout=timeout, adaptive=adaptive)
+        return True
+    except TimeoutException:
+        return False